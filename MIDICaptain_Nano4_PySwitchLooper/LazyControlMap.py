@@ -0,0 +1,28 @@
+# emacs-mode: -*- python-*-
+# -*- coding: utf-8 -*-
+
+
+class LazyControlMap(object):
+    " Note/CC number to control element map which only creates the elements that are actually used "
+    __module__ = __name__
+
+    def __init__(self, factory):
+        # factory(number) must return a new control element, or None if the number shall not be mapped
+        self._factory = factory
+        self._elements = {}
+
+    def __getitem__(self, number):
+        # -1 (and everything else outside the MIDI range) means NONE in MIDI_Map.py
+        if (number < 0) or (number > 127):
+            return None
+        if number not in self._elements:
+            self._elements[number] = self._factory(number)
+        return self._elements[number]
+
+    def __len__(self):
+        # Number of control elements created so far
+        return len([element for element in self._elements.values() if element != None])
+
+
+# local variables:
+# tab-width: 4
@@ -0,0 +1,78 @@
+# emacs-mode: -*- python-*-
+# -*- coding: utf-8 -*-
+
+import Live
+from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
+from _Framework.InputControlElement import InputControlElement
+class LoopProgressComponent(ControlSurfaceComponent):
+    ' Component that sends the loop position of the selected track\'s playing or recording clip '
+    __module__ = __name__
+
+    def __init__(self, num_steps, tick_divider = 1):
+        ControlSurfaceComponent.__init__(self)
+        assert ((num_steps > 0) and (num_steps <= 127))
+        assert (tick_divider > 0)
+        self._progress_control = None
+        self._num_steps = num_steps         # Quantisation of the sent value (pixel resolution of the display)
+        self._tick_divider = tick_divider   # Sample only every n-th timer tick
+        self._ticks = 0
+        self._last_sent_value = -1
+        self._register_timer_callback(self._on_timer)
+
+    def disconnect(self):
+        self._unregister_timer_callback(self._on_timer)
+        self._progress_control = None
+        ControlSurfaceComponent.disconnect(self)
+
+    def set_progress_control(self, control):
+        assert ((control == None) or isinstance(control, InputControlElement))
+        if self._progress_control != control:
+            self._progress_control = control
+            self._last_sent_value = -1
+            self.update()
+
+    def update(self):
+        self._send_progress()
+
+    def _on_timer(self):
+        self._ticks += 1
+        if self._ticks < self._tick_divider:
+            return
+        self._ticks = 0
+        self._send_progress()
+
+    def _send_progress(self):
+        if (self._progress_control == None) or (not self.is_enabled()):
+            return
+        value = int(self._current_progress() * self._num_steps)
+        if value != self._last_sent_value:
+            self._last_sent_value = value
+            self._progress_control.send_value(value, True)
+
+    # Returns the position inside the loop of the selected track's playing/recording clip in range [0..1]
+    def _current_progress(self):
+        track = self.song().view.selected_track
+        if (track == None) or (not hasattr(track, 'playing_slot_index')):
+            return 0
+        slot_index = track.playing_slot_index
+        if (slot_index < 0) or (slot_index >= len(track.clip_slots)):
+            return 0
+        clip = track.clip_slots[slot_index].clip
+        if clip == None:
+            return 0
+        if clip.is_recording:
+            # Loop length is not known until recording ends: show the position inside the current bar
+            song = self.song()
+            bar_length = (4.0 * song.signature_numerator) / song.signature_denominator
+            position = song.current_song_time % bar_length
+            length = bar_length
+        else:
+            position = clip.playing_position - clip.loop_start
+            length = clip.loop_end - clip.loop_start
+        if length <= 0:
+            return 0
+        return max(0, min(position / length, 1))
+
+
+# local variables:
+# tab-width: 4
@@ -1,5 +1,6 @@
 from __future__ import with_statement
 
+import time
 import Live
 from _Framework.ControlSurface import ControlSurface
 from _Framework.InputControlElement import *
@@ -15,6 +16,8 @@ from .SpecialTransportComponent import SpecialTransportComponent
 from .SpecialSessionComponent import SpecialSessionComponent
 from .SpecialZoomingComponent import SpecialZoomingComponent
 from .SpecialViewControllerComponent import DetailViewControllerComponent
+from .LoopProgressComponent import LoopProgressComponent
+from .LazyControlMap import LazyControlMap
 from .MIDI_Map import *
 
 
@@ -38,10 +41,11 @@ class MIDICaptain_Nano4_PySwitchLooper(ControlSurface):   # Make sure you update
 
     def __init__(self, c_instance):
         ControlSurface.__init__(self, c_instance)
+        start_time = time.time()
         # self.set_suppress_rebuild_requests(True)
         with self.component_guard():
-            self._note_map = []
-            self._ctrl_map = []
+            self._note_map = None
+            self._ctrl_map = None
             self._load_MIDI_map()
             self._session = None
             self._session_zoom = None
@@ -50,11 +54,13 @@ class MIDICaptain_Nano4_PySwitchLooper(ControlSurface):   # Make sure you update
             #self._setup_mixer_control()
             #self._session.set_mixer(self._mixer)
             self._setup_device_and_transport_control()
+            self._setup_loop_progress()
             #self.set_highlighting_session_component(self._session)
             # self.set_suppress_rebuild_requests(False)
         self._pads = []
         #self._load_pad_translations()
         #self._do_combine()
+        self.log_message('%s: loaded in %d ms (%d buttons, %d controls)' % (self.__class__.__name__, int((time.time() - start_time) * 1000), len(self._note_map), len(self._ctrl_map)))
 
     def disconnect(self):
         self._note_map = None
@@ -73,7 +79,8 @@ class MIDICaptain_Nano4_PySwitchLooper(ControlSurface):   # Make sure you update
             MIDICaptain_Nano4_PySwitchLooper._combine_active_instances()  # Make sure you update the name
 
     def _do_uncombine(self):
-        if (self in MIDICaptain_Nano4_PySwitchLooper._active_instances) and MIDICaptain_Nano4_PySwitchLooper._active_instances.remove(self):    # Make sure you update the name
+        if self in MIDICaptain_Nano4_PySwitchLooper._active_instances:    # Make sure you update the name
+            MIDICaptain_Nano4_PySwitchLooper._active_instances.remove(self)    # Make sure you update the name
             self._session.unlink()
             MIDICaptain_Nano4_PySwitchLooper._combine_active_instances()  # Make sure you update the name
 
@@ -188,6 +195,11 @@ class MIDICaptain_Nano4_PySwitchLooper(ControlSurface):   # Make sure you update
         transport.set_punch_buttons(self._note_map[PUNCHIN], self._note_map[PUNCHOUT])
         # transport.set_song_position_control(self._ctrl_map[SONGPOSITION]) #still not implemented as of Live 8.1.6
 
+    def _setup_loop_progress(self):
+        self._loop_progress = LoopProgressComponent(LOOPPROGRESS_STEPS, LOOPPROGRESS_TICKS)
+        self._loop_progress.name = 'Loop_Progress'
+        self._loop_progress.set_progress_control(self._note_map[LOOPPROGRESS])
+
     def _on_selected_track_changed(self):
         ControlSurface._on_selected_track_changed(self)
         track = self.song().view.selected_track
@@ -208,18 +220,20 @@ class MIDICaptain_Nano4_PySwitchLooper(ControlSurface):   # Make sure you update
             self.set_pad_translations(tuple(self._pads))
 
     def _load_MIDI_map(self):
+        # Elements are only created for the note/CC numbers assigned in MIDI_Map.py (when first accessed by
+        # the setup methods), so unassigned numbers do not register with Live's MIDI dispatch at all.
+        self._note_map = LazyControlMap(self._create_button)
+        self._ctrl_map = LazyControlMap(self._create_control)
+
+    def _create_button(self, note):
         is_momentary = True
-        for note in range(128):
-            button = ButtonElement(is_momentary, MESSAGETYPE, BUTTONCHANNEL, note)
-            button.name = 'Note_' + str(note)
-            self._note_map.append(button)
-        self._note_map.append(None)     # add None to the end of the list, selectable with [-1]
+        button = ButtonElement(is_momentary, MESSAGETYPE, BUTTONCHANNEL, note)
+        button.name = 'Note_' + str(note)
+        return button
+
+    def _create_control(self, ctrl):
         if MESSAGETYPE == MIDI_CC_TYPE and BUTTONCHANNEL == SLIDERCHANNEL:
-            for ctrl in range(128):
-                self._ctrl_map.append(None)
-        else:
-            for ctrl in range(128):
-                control = SliderElement(MIDI_CC_TYPE, SLIDERCHANNEL, ctrl)
-                control.name = 'Ctrl_' + str(ctrl)
-                self._ctrl_map.append(control)
-            self._ctrl_map.append(None)
+            return None
+        control = SliderElement(MIDI_CC_TYPE, SLIDERCHANNEL, ctrl)
+        control.name = 'Ctrl_' + str(ctrl)
+        return control
@@ -41,6 +41,12 @@ RECQUANT = -1   # Record quantization on/off
 DETAILVIEW = -1   # Detail view switch
 CLIPTRACKVIEW = -1  # Clip/Track view switch
 
+# Loop Progress (feedback sent to the controller). LOOPPROGRESS and LOOPPROGRESS_STEPS have to match
+# LOOPER_CC_LOOP_PROGRESS and LOOPER_LOOP_PROGRESS_STEPS in the config.py of PySwitch.
+LOOPPROGRESS = 24   # Button/pad number the loop position of the selected track's playing/recording clip is sent to (same message type and channel as the buttons)
+LOOPPROGRESS_STEPS = 120    # Resolution of the sent position (max. 127). Set this to the pixel width (or an integer fraction of it) of the progress bar on the controller.
+LOOPPROGRESS_TICKS = 1  # Sample the position every n-th timer tick of Live (about 100ms each)
+
 # Device Control
 DEVICELOCK = -1  # Device Lock (lock "blue hand")
 DEVICEONOFF = -1  # Device on/off
@@ -25,10 +25,24 @@ Config = {
     # and other displays if assigned. 200 is the default.
     #"updateInterval": 200,
 
+    # If set, request messages are not sent all at once, but spread evenly over the update interval, with
+    # at most this amount of requests per update interval. Requests for visible labels are sent first, then the ones
+    # for actions only using LEDs, and requests for actions on currently hidden pages are sent last. Only affects parameters which are requested (not the ones handled by a bidirectional protocol).
+    # Default is 0 (send immediately).
+    #"maxRequestsPerUpdate": 10,
+
     # Amount of bytes that must at least be free at the time processing starts (normally the program requires anther about
     # 10kB for character loading etc., default threshold for the warning is 15kB).
     #"memoryWarnLimitBytes": 1024 * 15,
 
+    # If set, garbage collection is done in idle windows (no switch held, no MIDI pending) as soon as less than this 
+    # amount of bytes are free, to avoid collection pauses in the middle of switch pushes or MIDI bursts. 
+    # 16kB is a good value to start with. Default is 0 (CircuitPython collects on its own only).
+    #"gcHeadroomBytes": 1024 * 16,
+
+    # Minimum time between two idle garbage collections in milliseconds. Default is 1000.
+    #"gcMinIntervalMillis": 1000,
+
     # Enables file transfer via MIDI from and to the device using PyMidiBridge (https://github.com/Tunetown/PyMidiBridge).
     # This costs about 11kB of RAM, so if you run into memory issues, disable this.
     "enableMidiBridge": True,
@@ -56,6 +70,9 @@ Config = {
     #"debugSentMessages": True,                       # Shows all sent messages
     #"excludeMessageTypes": [ "SystemExclusive" ],    # Types to excude from "debugUnparsedMessage"
     #"debugClientStats": True,                        # Periodically shows client information (pending requests etc.). "debugStatsInterval" is used as period.
+    #"debugAllocations": True,                        # Periodically shows the subsystems allocating the most memory per tick. "debugStatsInterval" is used as period.
+    #"debugLatency": True,                            # Periodically shows a histogram of the latencies from switch push/release to the first sent MIDI message, per switch. "debugStatsInterval" is used as period.
+    #"debugLatencyBudgetMillis": 5,                   # If set with debugLatency, an exception is raised when a latency exceeds this (for automated tests in a simulator)
 
     # When a ClientParameterMapping instance is set here, incoming messages for this mapping will be shown.
     #"debugMapping": MAPPING_MORPH_PEDAL(),
@@ -65,3 +82,9 @@ Config = {
     # Use this to detect the switch assignments on unknown devices. Optional.
     #"exploreMode": True
 }
+
+
+# Looper definitions (Ableton remote script). These have to match the LOOPPROGRESS and LOOPPROGRESS_STEPS
+# settings in MIDI_Map.py of the remote script.
+LOOPER_CC_LOOP_PROGRESS = 24           # CC the loop position of the selected track's clip is sent to
+LOOPER_LOOP_PROGRESS_STEPS = 120       # Resolution of the loop position
@@ -6,6 +6,11 @@ from pyswitch.ui.ui import DisplayElement
 from pyswitch.ui.ui import DisplayBounds
 from pyswitch.ui.elements import DisplayLabel
 from pyswitch.ui.elements import BidirectionalProtocolState
+from pyswitch.ui.elements import ProgressBar
+from pyswitch.controller.client import ClientParameterMapping
+from adafruit_midi.control_change import ControlChange
+from config import LOOPER_CC_LOOP_PROGRESS
+from config import LOOPER_LOOP_PROGRESS_STEPS
 
 
 _ACTION_LABEL_LAYOUT = {
@@ -34,6 +39,9 @@ _FOOTER_Y = const(
 _RIG_NAME_HEIGHT = const(
     160
 )
+_PROGRESS_HEIGHT = const(
+    6
+)
 
 
 DISPLAY_HEADER_1 = DisplayLabel(
@@ -105,6 +113,19 @@ Splashes = TunerDisplayCallback(
                 }, 
                 callback = KemperRigNameCallback()
             ),
+            ProgressBar(
+                mapping = ClientParameterMapping.get(
+                    name = "Loop Progress",
+                    response = ControlChange(LOOPER_CC_LOOP_PROGRESS, 0)
+                ),
+                bounds = DisplayBounds(
+                    x = 0, 
+                    y = _FOOTER_Y - _PROGRESS_HEIGHT, 
+                    w = _DISPLAY_WIDTH, 
+                    h = _PROGRESS_HEIGHT
+                ),
+                max_value = LOOPER_LOOP_PROGRESS_STEPS
+            ),
             BidirectionalProtocolState(
                 DisplayBounds(
                     x = 0, 
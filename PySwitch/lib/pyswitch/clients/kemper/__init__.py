@@ -4,10 +4,11 @@ from adafruit_midi.control_change import ControlChange
 from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.program_change import ProgramChange
 
-from ...misc import PeriodCounter, do_print, PYSWITCH_VERSION
+from ...misc import PeriodCounter, do_print, get_current_millis, PYSWITCH_VERSION
+from ...stats import Statistics
 from ...colors import Colors
 from ...controller.callbacks import Callback
-from ...controller.client import ClientParameterMapping, ClientTwoPartParameterMapping
+from ...controller.client import ClientParameterMapping, ClientMultiPartParameterMapping
 from ...ui.elements import TunerDisplay
 
 
@@ -529,7 +530,7 @@ class KemperMappings:
     
     # Rig ID
     def RIG_ID():
-        return ClientTwoPartParameterMapping.get(
+        return ClientMultiPartParameterMapping.get(
             name = "Rig ID",
             response = [
                 ControlChange(
@@ -571,17 +572,41 @@ _PARAMETER_SET_2 = [
     KemperMappings.TUNER_DEVIANCE()
 ]
 
-_SELECTED_PARAMETER_SET_ID = const(0x02)
-_SELECTED_PARAMETER_SET = _PARAMETER_SET_2
+# Parameter sets which can be selected in the bidirectional protocol, as (set ID, parameters pushed by 
+# the device), ordered by size. The protocol uses the smallest one covering the parameters used by the 
+# configuration. Parameters not covered by the selected set are requested periodically like without protocol.
+_PARAMETER_SETS = (
+    (const(0x02), _PARAMETER_SET_2),
+)
+
+# Response templates for the tuner (these are only needed if the tuner mode state is used, but then all of them)
+_TUNER_PARAMETERS = (
+    KemperMappings.TUNER_MODE_STATE(),
+    KemperMappings.TUNER_NOTE(),
+    KemperMappings.TUNER_DEVIANCE()
+)
+
+# Returns a key for fast lookup of parameter responses: function code, address page and address number
+def _response_key(data):
+    return (data[2] << 16) | (data[4] << 8) | data[5]
 
 
 # Implements the internal Kemper bidirectional communication protocol
 class KemperBidirectionalProtocol: #(BidirectionalProtocol):
     
-    _STATE_OFFLINE = 10   # No commmunication initiated
-    _STATE_RUNNING = 20   # Bidirectional communication established
+    _STATE_OFFLINE = 10      # No commmunication initiated
+    _STATE_RUNNING = 20      # Bidirectional communication established
+    _STATE_RECOVERING = 30   # Sensing messages overdue: Values are kept while waiting for the device
+
+    # Factor for the sensing interval deviation when determining the sensing timeout
+    _SENSING_DEVIATION_FACTOR = const(4)
 
-    def __init__(self, time_lease_seconds):
+    def __init__(self, 
+                 time_lease_seconds, 
+                 min_sensing_timeout_millis = 1500,     # The sensing timeout never gets shorter than this
+                 max_sensing_timeout_millis = 6000,     # The sensing timeout never gets longer than this
+                 recovery_timeout_millis = 5000         # Time to wait for sensing messages to re-appear before the connection is re-initialized
+        ):
         self.state = self._STATE_OFFLINE
         self.__time_lease_encoded = self.__encode_time_lease(time_lease_seconds)
 
@@ -595,28 +620,115 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
         # Period for initial beacons (those shall not be sent too often)
         self.init_period = PeriodCounter(5000)
 
-        # Period after which communication will be regarded as broken when no sensing message comes in
-        # (the device sends this roughly every 500ms so we wait 1.5 seconds which should be sufficient)
-        self.sensing_period = PeriodCounter(1500)
+        # Period after which communication will be regarded as stalled when no sensing message comes in. This
+        # adapts to the observed sensing intervals: The device sends roughly every 500ms, but on a congested USB 
+        # connection, the messages arrive with more jitter.
+        self.__min_sensing_timeout = min_sensing_timeout_millis
+        self.__max_sensing_timeout = max_sensing_timeout_millis
+        self.sensing_period = PeriodCounter(min_sensing_timeout_millis)
         self.sensing_period.reset()
 
+        # Estimations of the mean sensing interval and its mean deviation (integer milliseconds)
+        self.__sensing_interval_mean = 500
+        self.__sensing_interval_deviation = 250
+        self.__last_sensing_time = 0
+
+        # Period after which a stalled connection is regarded as lost
+        self.recovery_period = PeriodCounter(recovery_timeout_millis)
+        self.__recovery_start_time = 0
+
+        # Link quality statistics (shown when the debugStats option is enabled)
+        self.stats = Statistics("Bidirectional link")
+
         self.debug = False   # This is set by the BidirectionalClient constructor
         self.__count_relevant_messages = 0
+        self.__count_discarded_messages = 0
         self.__has_been_running = False
         self.__init_sent = False
+
+        # Selected parameter set (the largest one until select_parameters() has been called)
+        self.__parameter_set_id = _PARAMETER_SETS[-1][0]
+        self.__parameter_set = _PARAMETER_SETS[-1][1]
+
+        # Response keys of parameters which are pushed by the device but not used
+        self.__discard_keys = None
         
     # Called before usage, with a midi handler.
     def init(self, midi, client):
         self.__midi = midi  
         self.__client = client
 
+    # Selects the smallest parameter set covering the passed (used) mappings. Pushed values of
+    # unused parameters of the set will be discarded directly.
+    def select_parameters(self, mappings):
+        needed = [m for m in _PARAMETER_SETS[-1][1] if m in mappings]
+        if _TUNER_PARAMETERS[0] in needed:
+            needed += [m for m in _TUNER_PARAMETERS if m not in needed]
+
+        # Smallest set covering all needed parameters, or the one covering most of them
+        best_coverage = -1
+        for set_id, parameter_set in _PARAMETER_SETS:
+            coverage = len([m for m in needed if m in parameter_set])
+            if coverage > best_coverage:
+                best_coverage = coverage
+                self.__parameter_set_id = set_id
+                self.__parameter_set = parameter_set
+
+            if coverage == len(needed):
+                break
+
+        unused = [m for m in self.__parameter_set if m not in needed]
+        self.__discard_keys = set([_response_key(m.response.data) for m in unused])
+
+        if self.debug:                     # pragma: no cover
+            self.__print(f"Parameter set { repr(self.__parameter_set_id) }: Using { repr(len(self.__parameter_set) - len(unused)) } of { repr(len(self.__parameter_set)) } parameters, discarding { repr(len(unused)) }")
+
+    # Called for bidirectional mappings registered after select_parameters(): Their values
+    # are not discarded anymore.
+    def use(self, mapping):
+        if not self.__discard_keys:
+            return
+        
+        used = _TUNER_PARAMETERS if mapping in _TUNER_PARAMETERS else [mapping]
+        
+        for m in used:
+            self.__discard_keys.discard(_response_key(m.response.data))
+
     # Must return (boolean) if the passed mapping is handled in the bidirectional protocol
     def is_bidirectional(self, mapping):
-        return mapping in _SELECTED_PARAMETER_SET
+        return mapping in self.__parameter_set
+
+    # Returns if the message is a value of an unused parameter of the set, which can be dropped
+    def discard(self, midi_message):
+        if not self.__discard_keys:
+            return False
+        
+        if not isinstance(midi_message, SystemExclusive):
+            return False
+        
+        data = midi_message.data
+        if len(data) < 6:
+            return False
+
+        if not _response_key(data) in self.__discard_keys:
+            return False
+        
+        if midi_message.manufacturer_id != self.__mapping_sense.response.manufacturer_id:
+            return False
+        
+        if self.debug:                     # pragma: no cover
+            self.__count_discarded_messages += 1
+
+        return True
 
     # Must return a color representation for the current state
     def get_color(self):
-        return Colors.GREEN if self.state == self._STATE_RUNNING else Colors.RED
+        if self.state == self._STATE_RUNNING:
+            return Colors.GREEN
+        elif self.state == self._STATE_RECOVERING:
+            return Colors.YELLOW
+        else:
+            return Colors.RED
  
     # Must return (boolean) if the passed mapping should feed back the set value immediately
     # without waiting for a midi message.
@@ -630,7 +742,11 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
                 if self.debug:                     # pragma: no cover
                     self.__print("Initialize")
 
+                # The device will send all values again: Notify the listeners once after the connection has been lost.
                 if self.__has_been_running:
+                    self.__has_been_running = False
+                    self.stats.add("resyncs")
+
                     self.__client.notify_connection_lost()                    
 
                 self.__init_sent = True
@@ -638,10 +754,17 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
 
         elif self.state == self._STATE_RUNNING:
             if self.sensing_period.exceeded:
-                self.state = self._STATE_OFFLINE
+                # Sensing overdue: Keep all values and refresh the lease, but do not request a full re-sync yet
+                self.state = self._STATE_RECOVERING
+                self.__recovery_start_time = get_current_millis()
+                self.recovery_period.reset()
+                self.stats.add("gaps")
 
                 if self.debug:                     # pragma: no cover
-                    self.__print("Lost connection")                
+                    self.__print("Sensing overdue")                
+
+                self.__send_beacon()
+                self.resend_period.reset()
 
             elif self.resend_period.exceeded:
                 if self.debug:                     # pragma: no cover
@@ -649,6 +772,14 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
 
                 self.__send_beacon()
 
+        elif self.state == self._STATE_RECOVERING:
+            if self.recovery_period.exceeded:
+                self.state = self._STATE_OFFLINE
+                self.__last_sensing_time = 0
+
+                if self.debug:                     # pragma: no cover
+                    self.__print("Lost connection")                
+
     # Receive sensing messages and re-init (with init = 1 again) when they stop appearing for longer then 1 second
     def receive(self, midi_message):
         if not self.__init_sent:
@@ -674,7 +805,24 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
         if midi_message.data[2:5] != self.__mapping_sense.response.data[2:5]:
             return False
         
-        if self.state != self._STATE_RUNNING:
+        now = get_current_millis()
+
+        if self.__last_sensing_time:
+            self.__update_sensing_timeout(now - self.__last_sensing_time)
+        self.__last_sensing_time = now
+
+        if self.state == self._STATE_RECOVERING:
+            # Sensing messages re-appeared in time: Just continue, no re-sync needed
+            recovery_time = now - self.__recovery_start_time
+            self.stats.set("lastRecoveryMs", recovery_time)
+            self.stats.max("maxRecoveryMs", recovery_time)
+
+            if self.debug:                     # pragma: no cover
+               self.__print(f"Connection recovered after { repr(recovery_time) }ms")
+
+            self.state = self._STATE_RUNNING
+
+        elif self.state != self._STATE_RUNNING:
             self.resend_period.reset()
             
             if self.debug:                     # pragma: no cover
@@ -687,6 +835,28 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
 
         return True
 
+    # Updates the estimations of sensing interval mean and deviation with a new observed interval, and 
+    # sets the sensing timeout to mean + k * deviation. Integer exponential moving averages with 
+    # factors 1/8 (mean) and 1/4 (deviation) are used, as in TCP retransmission timeout estimation.
+    def __update_sensing_timeout(self, interval):
+        diff = interval - self.__sensing_interval_mean
+        
+        self.__sensing_interval_mean += diff >> 3
+        self.__sensing_interval_deviation += ((diff if diff >= 0 else -diff) - self.__sensing_interval_deviation) >> 2
+
+        timeout = self.__sensing_interval_mean + self._SENSING_DEVIATION_FACTOR * self.__sensing_interval_deviation
+        
+        if timeout < self.__min_sensing_timeout:
+            timeout = self.__min_sensing_timeout
+        if timeout > self.__max_sensing_timeout:
+            timeout = self.__max_sensing_timeout
+
+        self.sensing_period.interval = timeout
+
+        self.stats.set("senseMeanMs", self.__sensing_interval_mean)
+        self.stats.set("senseDevMs", self.__sensing_interval_deviation)
+        self.stats.set("timeoutMs", timeout)
+
     # Send beacon for bidirection communication
     def __send_beacon(self, init = False):
         self.__midi.send(
@@ -694,7 +864,7 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
                 0x7e,
                 [
                     0x40,
-                    _SELECTED_PARAMETER_SET_ID,
+                    self.__parameter_set_id,
                     self.__get_flags(
                         init = init,
                         tunemode = True
@@ -720,5 +890,6 @@ class KemperBidirectionalProtocol: #(BidirectionalProtocol):
         return 0x00 | (i << 0) | (s << 1) | (e << 2) | (n << 3) | (c << 4) | (t << 5)
 
     def __print(self, msg):                     # pragma: no cover
-        do_print(f"Bidirectional: { msg } (Received { repr(self.__count_relevant_messages) })")
+        do_print(f"Bidirectional: { msg } (Received { repr(self.__count_relevant_messages) }, discarded { repr(self.__count_discarded_messages) })")
         self.__count_relevant_messages = 0
+        self.__count_discarded_messages = 0
@@ -30,6 +30,32 @@ def EFFECT_STATE(slot_id,
     })
 
 
+# Effect category per Kemper effect type (index), for all types below 256. Types above are reverbs.
+# NOTE: The ranges are defined by Kemper with a lot of unused numbers, so the borders between types
+# could need to be adjusted with future Kemper firmware updates! The categories are:
+#    0: None, 1-10, 12: Wah, 11, 13: Pitch, 15-45: Distortion, 46-55: Compressor, 56-60: Noise Gate, 61-64: Space,
+#    65-80: Chorus, 81-95: Phaser/Flanger, 96-110: Equalizer, 111-120: Booster, 121-125: Looper,
+#    126-135: Pitch, 136-143: Dual, 144-170: Delay, 14, 171-: Reverb
+_CATEGORIES = (
+    b"\x00\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x0b\x01\x0b\x0e\x02"   # 0..15
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02"   # 16..31
+    b"\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x02\x03\x03"   # 32..47
+    b"\x03\x03\x03\x03\x03\x03\x03\x03\x04\x04\x04\x04\x04\x05\x05\x05"   # 48..63
+    b"\x05\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06\x06"   # 64..79
+    b"\x06\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07"   # 80..95
+    b"\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x08\x09"   # 96..111
+    b"\x09\x09\x09\x09\x09\x09\x09\x09\x09\x0a\x0a\x0a\x0a\x0a\x0b\x0b"   # 112..127
+    b"\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c"   # 128..143
+    b"\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d"   # 144..159
+    b"\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0d\x0e\x0e\x0e\x0e\x0e"   # 160..175
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e"   # 176..191
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e"   # 192..207
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e"   # 208..223
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e"   # 224..239
+    b"\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e"   # 240..255
+)
+
+
 # Used for effect enable/disable ParameterAction
 class KemperEffectEnableCallback(EffectEnableCallback):
 
@@ -106,40 +132,10 @@ class KemperEffectEnableCallback(EffectEnableCallback):
 
     # Must return the effect category for a mapping value
     def get_effect_category(self, kpp_effect_type):
-        # NOTE: The ranges are defined by Kemper with a lot of unused numbers, so the borders between types
-        # could need to be adjusted with future Kemper firmware updates!
-        if (kpp_effect_type == 0):
-            return self.CATEGORY_NONE
-        elif (0 < kpp_effect_type and kpp_effect_type <= 10) or kpp_effect_type == 12:
-            return self.CATEGORY_WAH
-        elif kpp_effect_type == 11 or kpp_effect_type == 13:
-            return self.CATEGORY_PITCH
-        elif (14 < kpp_effect_type and kpp_effect_type <= 45):
-            return self.CATEGORY_DISTORTION
-        elif (45 < kpp_effect_type and kpp_effect_type <= 55):
-            return self.CATEGORY_COMPRESSOR
-        elif (55 < kpp_effect_type and kpp_effect_type <= 60):
-            return self.CATEGORY_NOISE_GATE       
-        elif (60 < kpp_effect_type and kpp_effect_type <= 64):
-            return self.CATEGORY_SPACE            
-        elif (64 < kpp_effect_type and kpp_effect_type <= 80):
-            return self.CATEGORY_CHORUS
-        elif (80 < kpp_effect_type and kpp_effect_type <= 95):
-            return self.CATEGORY_PHASER_FLANGER
-        elif (95 < kpp_effect_type and kpp_effect_type <= 110):
-            return self.CATEGORY_EQUALIZER
-        elif (110 < kpp_effect_type and kpp_effect_type <= 120):
-            return self.CATEGORY_BOOSTER
-        elif (120 < kpp_effect_type and kpp_effect_type <= 125):
-            return self.CATEGORY_LOOPER
-        elif (125 < kpp_effect_type and kpp_effect_type <= 135):
-            return self.CATEGORY_PITCH
-        elif (135 < kpp_effect_type and kpp_effect_type <= 143):
-            return self.CATEGORY_DUAL
-        elif (143 < kpp_effect_type and kpp_effect_type <= 170):
-            return self.CATEGORY_DELAY
-        else:
-            return self.CATEGORY_REVERB
+        if kpp_effect_type < 256:
+            return _CATEGORIES[kpp_effect_type]
+        
+        return self.CATEGORY_REVERB
         
     # Must return the color for a category    
     def get_effect_category_color(self, category, kpp_effect_type):
@@ -153,12 +149,8 @@ class KemperEffectEnableCallback(EffectEnableCallback):
         if self.__text:
             return self.__text
         
-        if self.__extended_type_names:
-            if kpp_effect_type in self.__extended_type_names:
-                name = self.__extended_type_names[kpp_effect_type]
-            else:
-                name = self.CATEGORY_NAMES[category]
-        else:
+        name = self.__extended_type_names.get(kpp_effect_type, None) if self.__extended_type_names else None
+        if name == None:
             name = self.CATEGORY_NAMES[category]
 
         if self.__slot_name:
@@ -1,9 +1,9 @@
+from array import array
 from ....controller.actions import PushButtonAction
 from .effect_state import KemperEffectEnableCallback
 
 # Switch an effect slot on / off. This variant has distinct names for each effect type. 
-# 
-# <b>Use with care:</b> This takes quite some RAM memory, so if you run a large configuration you might run into memory allocation failures. In this case, just use the normal Effect State action instead.
+# The names are stored in compact tables shared by all slots.
 def EFFECT_STATE_EXT(slot_id, 
                      display = None, 
                      mode = PushButtonAction.HOLD_MOMENTARY,
@@ -30,113 +30,62 @@ def EFFECT_STATE_EXT(slot_id,
     })
 
 
-_EFFECT_TYPE_NAMES = {
-    0: "Empty",
-    1: "Wah",
-    2: "LP",
-    3: "HP",
-    4: "Vowel",
-    6: "Wah Ph",  
-    7: "Wah Fl",
-    8: "Wah RR",
-    9: "Ring",
-    10: "FShift",
-    11: "Pitch",
-    12: "Wah Form",
-    13: "VinylStp",
-    
-    17: "Bit Shp",
-    18: "Octa Shp",
-    19: "Soft Shp",
-    20: "Hard Shp",
-    21: "Wave Shp",
-    32: "KDrive",
-    33: "Green",
-    34: "Plus DS",
-    35: "One DS",
-    36: "Muff",
-    37: "Mouse",
-    38: "KFuzz",
-    39: "Metal DS",
-    42: "Full OC",
+# Effect type names table. The names for the type IDs are stored in a byte string, their offsets are
+# stored in a separate array (with one extra entry for the end of the last name). The type IDs must be 
+# sorted ascending as they are searched by bisection.
+_TYPE_IDS = array('B', (
+    0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13, 17, 18, 19,
+    20, 21, 32, 33, 34, 35, 36, 37, 38, 39, 42, 49, 50, 57, 58, 64,
+    65, 66, 67, 68, 69, 70, 71, 75, 76, 77, 78, 79, 80, 81, 82, 83,
+    89, 90, 97, 98, 99, 100, 101, 102, 103, 104, 113, 114, 115, 116, 121, 122,
+    123, 129, 130, 131, 132, 137, 138, 139, 140, 145, 146, 147, 148, 149, 150, 151,
+    152, 161, 162, 163, 164, 165, 166, 177, 178, 179, 180, 181, 182, 183, 193,
+))
 
-    49: "Comp",
-    50: "Swell",
-    57: "Gate 2:1",
-    58: "Gate 4:1",
-    64: "Space",
-    
-    65: "VChorus",
-    66: "HChorus",
-    67: "Air Ch.",
-    68: "Vibrato",
-    69: "Rotary",
-    70: "Tremolo",
-    71: "MPitch",
+_NAME_OFFSETS = array('H', (
+    0, 5, 8, 10, 12, 17, 23, 29, 35, 39, 45, 50, 58, 66, 73, 81,
+    89, 97, 105, 111, 116, 123, 129, 133, 138, 143, 151, 158, 162, 167, 175, 183,
+    188, 195, 202, 209, 216, 222, 229, 235, 242, 250, 255, 258, 266, 272, 278, 282,
+    289, 296, 303, 310, 318, 325, 333, 337, 343, 350, 356, 362, 366, 371, 379, 383,
+    387, 395, 401, 410, 418, 424, 433, 441, 450, 458, 464, 470, 477, 485, 493, 500,
+    509, 518, 525, 532, 540, 547, 555, 563, 570, 576, 583, 587, 593, 600, 606, 612,
+))
 
-    81: "Phaser",
-    82: "Vibe",
-    83: "Ph 1way",
-    89: "Flanger",
-    90: "Fl 1way",
- 
-    97: "Graphic",
-    98: "StudioEQ",
-    99: "MetalEQ",
-    100: "Acoustic",
-    101: "Wide",
-    102: "WidePh",
-    103: "WideDLY",
-    104: "Double",
+_NAMES = (
+    b"EmptyWahLPHPVowelWah PhWah FlWah RR"                                   # 0, 1, 2, 3, 4, 6, 7, 8
+    b"RingFShiftPitchWah FormVinylStpBit ShpOcta ShpSoft Shp"                # 9, 10, 11, 12, 13, 17, 18, 19
+    b"Hard ShpWave ShpKDriveGreenPlus DSOne DSMuffMouse"                     # 20, 21, 32, 33, 34, 35, 36, 37
+    b"KFuzzMetal DSFull OCCompSwellGate 2:1Gate 4:1Space"                    # 38, 39, 42, 49, 50, 57, 58, 64
+    b"VChorusHChorusAir Ch.VibratoRotaryTremoloMPitchTremolo"                # 65, 66, 67, 68, 69, 70, 71, 75
+    b"HarmTremPulseSawPulsePanSawPanPhaserVibePh 1way"                       # 76, 77, 78, 79, 80, 81, 82, 83
+    b"FlangerFl 1wayGraphicStudioEQMetalEQAcousticWideWidePh"                # 89, 90, 97, 98, 99, 100, 101, 102
+    b"WideDLYDoubleTrebleLeadBoostWahBoostLoopLoop"                          # 103, 104, 113, 114, 115, 116, 121, 122
+    b"LoopDistTranspChromPtchHarmPtchOctaveDualChromDualHarmDualCryst"       # 123, 129, 130, 131, 132, 137, 138, 139
+    b"DualLoopLDelaySDelayDualDly2TpDelayS2TDelayCrystalLoopPitch"           # 140, 145, 146, 147, 148, 149, 150, 151
+    b"FShiftDlyRhDelayMeloChrMeloHarmQuadDlyQuadChrmQuadHarmLReverb"         # 152, 161, 162, 163, 164, 165, 166, 177
+    b"NatRevEasyRevEchoCirrusFormRevSphereSpring"                            # 178, 179, 180, 181, 182, 183, 193
+)
 
-    113: "Treble",
-    114: "Lead",
-    115: "Boost",
-    116: "WahBoost",
 
-    121: "Loop",  # Mono
-    122: "Loop",  # Stereo
-    123: "LoopDist",
+# Lookup for the extended effect type names (dict-like)
+class _EffectTypeNames:
 
-    129: "Transp",
-    130: "ChromPtch",
-    131: "HarmPtch",
-    132: "Octave",
+    # Returns the name for an effect type, or default if not known
+    def get(self, kpp_effect_type, default = None):
+        lo = 0
+        hi = len(_TYPE_IDS)
 
-    137: "DualChrom",
-    138: "DualHarm",
-    139: "DualCryst",
-    140: "DualLoop",
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if _TYPE_IDS[mid] < kpp_effect_type:
+                lo = mid + 1
+            else:
+                hi = mid
 
-    145: "LDelay",    # Legacy Delay
-    146: "SDelay",    # Single
-    147: "DualDly",
-    148: "2TpDelay",
-    149: "S2TDelay",
-    150: "Crystal",
-    151: "LoopPitch",
-    152: "FShiftDly",
-    161: "RhDelay",
-    162: "MeloChr",
-    163: "MeloHarm",
-    164: "QuadDly",
-    165: "QuadChrm",
-    166: "QuadHarm",
-    
-    177: "LReverb",
-    178: "NatRev",
-    179: "EasyRev",
-    180: "Echo",
-    181: "Cirrus",
-    182: "FormRev",
-    183: "Sphere",
-    193: "Spring",
+        if lo == len(_TYPE_IDS) or _TYPE_IDS[lo] != kpp_effect_type:
+            return default
+        
+        return str(_NAMES[_NAME_OFFSETS[lo]:_NAME_OFFSETS[lo + 1]], "ascii")
 
-    # Undocumented:
-    75: "Tremolo",
-    76: "HarmTrem",
-    77: "Pulse",
-    78: "Saw",
-    79: "PulsePan",
-    80: "SawPan"
-}
+
+_EFFECT_TYPE_NAMES = _EffectTypeNames()
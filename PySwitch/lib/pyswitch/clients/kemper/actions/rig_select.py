@@ -23,7 +23,7 @@ def RIG_SELECT(rig,                                            # Rig to select.
                enable_callback = None,
                color_callback = None,                          # Optional callback for setting the color. Footprint: def callback(action, bank, rig) -> (r, g, b) where bank and rig are int starting from 0.
                color = None,                                   # Color override (if no text callback is passed)
-               text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0.
+               text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0. Use CACHED_RIG_NAME_TEXT (see rig_names.py) to show rig names.
                text = None,                                    # Text override (if no text callback is passed)
                auto_exclude_rigs = None,                       # If rig_off is "auto", this can be filled with a tuple or list of rigs to exclude from "remembering" when disabled
                rig_btn_morph = False,                          # If set True, second press will trigger toggling the internal morphing state (no command is sent, just the displays are toggled). Only if no rig_off or bank_off are specified.
@@ -125,6 +125,12 @@ class _KemperRigSelectCallback(Callback):
     def init(self, appl, listener = None):
         super().init(appl, listener)
 
+        # The rig name cache has to be set up before the client is initialized
+        if self.__text_callback:
+            from ..rig_names import CACHED_RIG_NAME_TEXT, KemperRigNameCache
+            if self.__text_callback == CACHED_RIG_NAME_TEXT:
+                KemperRigNameCache.instance(appl)
+
         self.__default_dim_factor_off = get_option(appl.config, "displayDimFactorOff", 0.2)
         self.__default_led_brightness_off = get_option(appl.config, "ledBrightnessOff", 0.02)
         self.__default_led_brightness_on = get_option(appl.config, "ledBrightnessOn", 0.3)
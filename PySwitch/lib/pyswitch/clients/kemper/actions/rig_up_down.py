@@ -17,7 +17,7 @@ def RIG_UP(keep_bank = True,                               # If enabled, the ban
            enable_callback = None,
            color_callback = None,                          # Optional callback for setting the color. Footprint: def callback(action, bank, rig) -> (r, g, b) where bank and rig are int starting from 0.
            color = None,                                   # Color override (if no text callback is passed)
-           text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0.
+           text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0. Use CACHED_RIG_NAME_TEXT (see rig_names.py) to show rig names.
            text = None,                                    # Text override (if no text callback is passed)
     ):
     
@@ -48,7 +48,7 @@ def RIG_DOWN(keep_bank = True,                               # If enabled, the b
              enable_callback = None,
              color_callback = None,                          # Optional callback for setting the color. Footprint: def callback(action, bank, rig) -> (r, g, b) where bank and rig are int starting from 0.
              color = None,                                   # Color override (if no text callback is passed)
-             text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0.
+             text_callback = None,                           # Optional callback for setting the text. Footprint: def callback(action, bank, rig) -> String where bank and rig are int starting from 0. Use CACHED_RIG_NAME_TEXT (see rig_names.py) to show rig names.
              text = None,                                    # Text override (if no text callback is passed)
     ):
     
@@ -106,6 +106,12 @@ class _KemperRigChangeCallback(Callback):
     def init(self, appl, listener = None):
         super().init(appl, listener)
 
+        # The rig name cache has to be set up before the client is initialized
+        if self.__text_callback:
+            from ..rig_names import CACHED_RIG_NAME_TEXT, KemperRigNameCache
+            if self.__text_callback == CACHED_RIG_NAME_TEXT:
+                KemperRigNameCache.instance(appl)
+
         self.__led_brightness = get_option(appl.config, "ledBrightnessOn", 0.3)
         self.__appl = appl
 
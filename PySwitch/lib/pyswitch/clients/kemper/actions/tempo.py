@@ -105,11 +105,11 @@ class _KemperShowTempoCallback(Callback):
     def release(self):
         pass
 
-    def update(self):
-        super().update()
+    def init(self, appl, listener = None):
+        super().init(appl, listener)
 
         if self.__preview:
-            self.__preview.update()
+            self.__preview.init(appl)
 
     def update_displays(self):
         # Tuner mode: Do nothing
@@ -1,6 +1,6 @@
 from micropython import const
 
-from ....controller.client import ClientTwoPartParameterMapping
+from ....controller.client import ClientMultiPartParameterMapping
 
 from adafruit_midi.control_change import ControlChange
 from adafruit_midi.program_change import ProgramChange
@@ -11,7 +11,7 @@ _CC_RIG_INDEX_PART_1 = const(32) # The second part will be sent as program chang
 
 # Selects a rig of the current bank. Rig index must be in range [0..4]
 def MAPPING_RIG_SELECT(rig):
-    return ClientTwoPartParameterMapping.get(
+    return ClientMultiPartParameterMapping.get(
         f"Select Rig { str(rig + 1) }",
         set = ControlChange(
             _CC_RIG_SELECT + rig,
@@ -31,7 +31,7 @@ def MAPPING_RIG_SELECT(rig):
 
 # Pre-selects a bank.
 def MAPPING_BANK_SELECT():
-    return ClientTwoPartParameterMapping.get(
+    return ClientMultiPartParameterMapping.get(
         name = "Select Bank",
         set = ControlChange(
             _CC_BANK_PRESELECT,
@@ -51,7 +51,7 @@ def MAPPING_BANK_SELECT():
 
 # # Selects a rig of a specific bank. Rig index must be in range [0..4]
 # def APPING_BANK_AND_RIG_SELECT(rig):
-#     return ClientTwoPartParameterMapping.get(
+#     return ClientMultiPartParameterMapping.get(
 #         name = f"Select Rig { str(rig + 1) } + Bank",
 #         set = [
 #             ControlChange(
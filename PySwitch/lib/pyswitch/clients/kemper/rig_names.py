@@ -0,0 +1,208 @@
+from os import stat
+from micropython import const
+from . import KemperMappings, NUM_RIGS_PER_BANK, NUM_BANKS
+from ...controller.callbacks import Callback
+from ...misc import PeriodCounter
+from ...stats import Statistics
+
+# Bytes stored per rig name (longer names are truncated)
+_NAME_LENGTH = const(24)
+
+# Maximum amount of names read from the file which are kept in memory
+_MAX_READ_NAMES = const(32)
+
+# Number of records in the cache file
+_NUM_RECORDS = const(NUM_RIGS_PER_BANK * NUM_BANKS)
+
+# Number of empty records appended to a new cache file per update
+_CREATE_CHUNK_RECORDS = const(25)
+
+
+# Text callback for RIG_SELECT and RIG_UP/RIG_DOWN (text_callback parameter), showing the cached 
+# rig names (see KemperRigNameCache). If a name is not known yet, the rig ID is shown.
+def CACHED_RIG_NAME_TEXT(action, bank, rig):
+    name = KemperRigNameCache.instance(action.appl).name(bank * NUM_RIGS_PER_BANK + rig)
+    return name if name else f"Rig { repr(bank + 1) }-{ repr(rig + 1) }"
+
+
+# Persistent cache for rig names, keyed by rig ID. Names are observed from the RIG_NAME parameter whenever
+# a rig is loaded, and stored in a file on the flash drive with fixed size records (one per rig of all banks),
+# so they are available across reboots without any MIDI traffic (for example for bank preselect previews).
+# Only names not yet written are held in memory: These are written in one go when no new names came in for
+# some time, to spare the flash memory. A missing file is created in small chunks over several updates.
+#
+# NOTE: Writing only works when the USB drive is not mounted (see boot.py).
+class KemperRigNameCache(Callback):
+
+    # Singleton instance
+    _instance = None
+
+    # Returns the cache instance, which is created and initialized on first call. This must be called
+    # during setup first (before the client is initialized), so the needed mappings are registered in time.
+    @staticmethod
+    def instance(appl):
+        if not KemperRigNameCache._instance:
+            KemperRigNameCache._instance = KemperRigNameCache()
+            KemperRigNameCache._instance.init(appl)
+
+        return KemperRigNameCache._instance
+
+    def __init__(self,
+                 file_name = "/rig_names.bin",    # Cache file
+                 write_delay_millis = 30000       # New names are written when no other names came in for this time
+        ):
+        super().__init__()
+
+        self.__file_name = file_name
+
+        self.__mapping_id = KemperMappings.RIG_ID()
+        self.register_mapping(self.__mapping_id)
+
+        self.__mapping_name = KemperMappings.RIG_NAME()
+        self.register_mapping(self.__mapping_name)
+
+        self.__pending = {}                               # Names not written yet (rig ID -> name)
+        self.__read = {}                                  # Names read from the file recently (rig ID -> name)
+        self.__write_period = PeriodCounter(write_delay_millis)
+        self.__writable = True
+        self.__num_records = 0                            # Number of records in the file
+        self.__record = bytearray(_NAME_LENGTH)           # Buffer for reading/writing records
+
+        # Last observed values. A name is stored when both the rig ID and the name have changed, as
+        # they come in in arbitrary order on rig changes.
+        self.__last_id = None
+        self.__last_name = None
+        self.__id_changed = False
+        self.__name_changed = False
+
+        self.__stats = Statistics("Rig names")
+
+    # Returns the cached name for the passed rig ID (bank * NUM_RIGS_PER_BANK + rig), or None if not known.
+    def name(self, rig_id):
+        name = self.__pending.get(rig_id, None)
+        if name != None:
+            return name
+        
+        if rig_id in self.__read:
+            return self.__read[rig_id]
+
+        try:
+            with open(self.__file_name, "rb") as f:
+                f.seek(rig_id * _NAME_LENGTH)
+                num = f.readinto(self.__record)
+        except OSError:
+            num = 0
+
+        if num != _NAME_LENGTH or not self.__record[0]:
+            self.__stats.add("misses")
+            name = None
+        else:
+            self.__stats.add("hits")
+
+            end = 0
+            while end < _NAME_LENGTH and self.__record[end]:
+                end += 1
+
+            name = str(self.__record[:end], "ascii")
+
+        if len(self.__read) >= _MAX_READ_NAMES:
+            self.__read.clear()
+
+        self.__read[rig_id] = name
+        return name
+
+    def init(self, appl, listener = None):
+        super().init(appl, listener)
+
+        # Number of complete records in an existing file (a file with a partial record is created again)
+        try:
+            size = stat(self.__file_name)[6]
+            self.__num_records = size // _NAME_LENGTH if size % _NAME_LENGTH == 0 else 0
+        except OSError:
+            self.__num_records = 0
+
+    def update(self):
+        super().update()
+
+        if not self.__writable:
+            return
+
+        if self.__num_records < _NUM_RECORDS:
+            self.__create_chunk()
+
+        elif self.__pending and self.__write_period.exceeded:
+            self.__write()
+
+    def parameter_changed(self, mapping):
+        if mapping == self.__mapping_id:
+            if mapping.value != self.__last_id:
+                self.__last_id = mapping.value
+                self.__id_changed = True
+
+        elif mapping == self.__mapping_name:
+            if mapping.value != self.__last_name:
+                self.__last_name = mapping.value
+                self.__name_changed = True
+
+        if not self.__id_changed or not self.__name_changed:
+            return
+
+        self.__id_changed = False
+        self.__name_changed = False
+
+        if self.__last_id == None or not self.__last_name or self.__last_id >= NUM_RIGS_PER_BANK * NUM_BANKS:
+            return
+
+        if self.name(self.__last_id) == self.__last_name:
+            return
+
+        self.__pending[self.__last_id] = self.__last_name
+        self.__read.pop(self.__last_id, None)
+        self.__write_period.reset()
+
+    def request_terminated(self, mapping):
+        pass
+
+    # Writes all pending names to the file
+    def __write(self):
+        pending = self.__pending
+        record = self.__record
+
+        try:
+            with open(self.__file_name, "r+b") as f:
+                for rig_id in pending:
+                    name = pending[rig_id]
+
+                    # Stored as ASCII (other characters are replaced)
+                    for i in range(_NAME_LENGTH):
+                        c = ord(name[i]) if i < len(name) else 0
+                        record[i] = c if c < 128 else 63
+
+                    f.seek(rig_id * _NAME_LENGTH)
+                    f.write(record)
+
+            self.__stats.add("writes")
+            self.__stats.add("names", len(pending))
+
+            self.__pending = {}
+
+        except OSError:
+            self.__set_read_only()
+
+    # Appends a chunk of empty records to the cache file, until it has all records
+    def __create_chunk(self):
+        empty = bytearray(_NAME_LENGTH)
+
+        try:
+            with open(self.__file_name, "ab" if self.__num_records else "wb") as f:
+                for _ in range(min(_CREATE_CHUNK_RECORDS, _NUM_RECORDS - self.__num_records)):
+                    f.write(empty)
+                    self.__num_records += 1
+
+        except OSError:
+            self.__set_read_only()
+
+    # Read-only file system: Keep the names in memory only from now on
+    def __set_read_only(self):
+        self.__writable = False
+        self.__stats.set("readOnly", True)
@@ -1,5 +1,7 @@
 from ....controller.callbacks import Callback
-from ....controller.actions import Action
+from ....controller.actions import Action, EnabledState
+from ....misc import get_current_millis
+from ....stats import Statistics
 
 class PagerAction(Callback, Action):
     class _EnableCallback(Callback):
@@ -7,8 +9,22 @@ class PagerAction(Callback, Action):
             super().__init__()
             self.__pager = pager
 
+            # The pager publishes page changes (see EnabledState)
+            self.publishes_changes = True
+
+            # Page ID -> list of actions with this ID which are controlled by the pager
+            self.page_actions = {}
+
         def enabled(self, action):
             return (action.id == self.__pager.current_page_id)
+        
+        # Called by every action using this callback in its constructor, so the pager 
+        # knows which actions are affected by a page change.
+        def add_action(self, action):
+            if action.id in self.page_actions:
+                self.page_actions[action.id].append(action)
+            else:
+                self.page_actions[action.id] = [action]
 
     # The PagerAction is used to control multiple other actions to provide paging. Define this action for one switch which will by default rotate through the defined pages.
     # For the actions you want to be part of pages, just assign them using the paging buttons (which will set the id and enable_callback parameters for you).
@@ -59,6 +75,9 @@ class PagerAction(Callback, Action):
 
         self.enable_callback = PagerAction._EnableCallback(self)
 
+        # Page flip latency (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Pager " + repr(self.id) if self.id else "Pager")
+
     # This controls a Pager Action from another switch, making it possible to directly select pages with dedicated switches.
     # 
     # You always need to have a Pager Action which defines the pages, which also MUST be assigned to a switch. Set "select_page" on this pager to the first page, and for selecting the other pages, create "Select Page" actions for other switches. For example, to have 3 pages and 3 switches:
@@ -99,6 +118,8 @@ class PagerAction(Callback, Action):
         self.current_page_index = 0
         self.current_page_id = self.pages[self.current_page_index]["id"] if len(self.pages) > 0 else None
 
+        EnabledState.changed()
+
     # Called when the switch is pushed down
     def push(self):
         if not len(self.pages):
@@ -109,18 +130,76 @@ class PagerAction(Callback, Action):
         
         if self.__select_page_index != None:
             # Direct select
-            self.current_page_index = self.__select_page_index
+            self.select_page_index(self.__select_page_index)
         else:
             # Next page
-            self.current_page_index += 1
-            while self.current_page_index >= len(self.pages):
-                self.current_page_index = 0
+            page_index = self.current_page_index + 1
+            while page_index >= len(self.pages):
+                page_index = 0
 
+            self.select_page_index(page_index)
+
+    # Selects a page by index. Only the actions of the old and new pages are updated, as well as
+    # the other actions on their switches (the LED segments are distributed among the enabled actions).
+    # The rest of the actions keep their state.
+    def select_page_index(self, page_index):
+        start = get_current_millis()
+
+        old_page_id = self.current_page_id
+
+        self.current_page_index = page_index
         self.current_page_id = self.pages[self.current_page_index]["id"] if len(self.pages) > 0 else None
 
-        self.appl.reset_actions()
+        if old_page_id != self.current_page_id:
+            EnabledState.changed()
+
+            page_actions = self.enable_callback.page_actions
+
+            old_actions = page_actions.get(old_page_id, None)
+            new_actions = page_actions.get(self.current_page_id, None)
+
+            # Disable the actions of the old page first, so the new ones get the LED segments of the switches
+            switches = []
+            num_updated = self.__update_enabled(old_actions, switches)
+            num_updated += self.__update_enabled(new_actions, switches)
+
+            # Update the other actions sharing a switch with a changed action
+            for switch in switches:
+                for action in switch.actions:
+                    if (old_actions and action in old_actions) or (new_actions and action in new_actions):
+                        continue
+
+                    if action.enabled:
+                        action.update_displays()
+
+            self.__stats.set("lastActions", num_updated)
+
         self.update_displays()
 
+        duration = get_current_millis() - start
+        self.__stats.add("flips")
+        self.__stats.set("lastMs", duration)
+        self.__stats.max("maxMs", duration)
+
+    # Updates the enabled state of all passed actions (if any), and returns how many have changed.
+    # The switches of changed actions are added to the passed list.
+    def __update_enabled(self, actions, switches):
+        if not actions:
+            return 0
+        
+        ret = 0
+        for action in actions:
+            if not action.update_enabled():
+                continue
+
+            ret += 1
+
+            switch = getattr(action, "switch", None)
+            if switch and switch not in switches:
+                switches.append(switch)
+
+        return ret
+
     def update_displays(self):
         if not len(self.pages):
             return
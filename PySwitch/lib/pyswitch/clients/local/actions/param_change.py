@@ -91,15 +91,15 @@ class _ParameterChangeCallback(Callback):
 
         self.__appl = appl
 
+        if self.__preview:
+            self.__preview.init(appl)
+
     def reset(self):
         self.__last_value = -1
 
     def update(self):
         super().update()
 
-        if self.__preview:
-            self.__preview.update()
-
         if self.__pushed and self.__repeat_period and self.__repeat_period.exceeded:
             self.push()
 
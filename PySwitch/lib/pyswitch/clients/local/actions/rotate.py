@@ -1,7 +1,7 @@
 from ....controller.callbacks import Callback
 from ....controller.actions import Action
 from ....colors import Colors
-from adafruit_midi.midi_message import MIDIMessage
+from ....controller.midi import RawMidiMessage
 
 # Sends a bunch of messages in rotating fashion. The messages as well as the colors and texts will be rotated on each press. 
 # 
@@ -57,13 +57,6 @@ def ROTATING_MESSAGES(messages = None,              # Raw MIDI messages bytes (a
 
 
 class _CustomMessagesCallback(Callback):
-    class _RawMessage(MIDIMessage):
-        def __init__(self, data):
-            self.__data = bytearray(data)
-
-        def __bytes__(self):
-            return self.__data
-
     def __init__(self, 
                  messages,
                  messages_release,
@@ -74,8 +67,9 @@ class _CustomMessagesCallback(Callback):
         ):
         super().__init__()
         
-        self.__messages = messages
-        self.__messages_release = messages_release
+        # Messages are compiled to bytes once, to be sent without conversion
+        self.__messages = tuple(RawMidiMessage(bytes(m)) for m in messages) if messages else None
+        self.__messages_release = tuple(RawMidiMessage(bytes(m)) for m in messages_release) if messages_release else None
         self.__led_colors = led_colors
         self.__led_brightness = led_brightness
         self.__display_colors = display_colors if display_colors else led_colors
@@ -92,11 +86,11 @@ class _CustomMessagesCallback(Callback):
 
     def push(self):
         if self.__messages:
-            self.__appl.client.midi.send(self._RawMessage(self.__messages[self.__messages_pos]))
+            self.__appl.client.midi.send(self.__messages[self.__messages_pos])
 
     def release(self):
         if self.__messages_release:
-            self.__appl.client.midi.send(self._RawMessage(self.__messages_release[self.__messages_release_pos]))
+            self.__appl.client.midi.send(self.__messages_release[self.__messages_release_pos])
 
         self.__next_step()
         self.update_displays()
@@ -1,4 +1,6 @@
 from ...misc import PeriodCounter, Updateable
+from ...stats import Statistics
+from . import EnabledState
 
 from adafruit_midi.system_exclusive import SystemExclusive
 
@@ -8,6 +10,12 @@ class AnalogAction(Updateable):
     def __init__(self, 
                  mapping,                           # Parameter mapping to be controlled
                  max_frame_rate = 24,               # Maximum frame rate for sending MIDI values (fps)
+                 idle_frame_rate = 5,               # Frame rate used when the pedal has not been moved for idle_timeout_millis (fps)
+                 idle_timeout_millis = 1000,        # Time after the last value change after which the idle frame rate is used
+                 smoothing = 2,                     # Smoothing of the input values: 0 means no smoothing, each step up halves the 
+                                                    # weight of new values (integer exponential moving average, applied on every tick).
+                 hysteresis = 0.5,                  # Hysteresis around the step boundaries, in step widths. The input has to move further than 
+                                                    # this from the last sent position to send a new value. Set to 0 to disable. Not used with transfer_function.
                  max_value = None,                  # Maximum value of the mapping (16383 for NRPN, 127 for CC) Set this to None to auto-detect these ranges.
                  num_steps = 128,                   # Number of steps to be regarded as different (saves MIDI traffic at the cost of precision).
                  enable_callback = None,            # Callback to set enabled state (optional). Must contain an enabled(action) function.
@@ -35,12 +43,25 @@ class AnalogAction(Updateable):
         self.__factor = 65536 / (max_value + 1)
         self.__max_value = max_value
         self.__period = PeriodCounter(1000 / max_frame_rate)
+        self.__active_interval = self.__period.interval
+        self.__idle_interval = 1000 / idle_frame_rate
+        self.__idle_period = PeriodCounter(idle_timeout_millis)
+        
+        self.__smoothing = int(smoothing)
+        self.__filter = -1                  # Smoothing accumulator (filtered value shifted up by the smoothing factor)
         
         self.__enable_callback = enable_callback
         if self.__enable_callback:
             self.__enable_callback.action = self
+            if hasattr(self.__enable_callback, "add_action"):
+                self.__enable_callback.add_action(self)
+            self.__enabled_state = EnabledState(self.__enable_callback)
+        else:
+            self.__enabled_state = None
 
         self.__step_width = int(65536 / num_steps)
+        self.__hysteresis = int(self.__step_width * hysteresis) if not transfer_function else 0
+        self.__last_input = -65536
         self.__last_value = -1
         self.__transfer_function = transfer_function
         self.__convert_value = convert_value
@@ -57,24 +78,49 @@ class AnalogAction(Updateable):
         else:
             self.__preview = None
 
+        # Sent messages per second (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Pedal " + repr(id) if id else "Pedal")
+        self.__stats_period = PeriodCounter(1000)
+        self.__num_sent = 0
+
     @property
     def enabled(self):
-        return self.__enable_callback.enabled(self) if self.__enable_callback else True
-
-    def update(self):
-        if self.__preview:
-            self.__preview.update()
+        return self.__enabled_state.get(self) if self.__enabled_state else True
 
     # is_pot tells whether the input is a potentiometer (True) or a rotary encoder (False)
     def init(self, appl):
         self.__appl = appl
 
+        if self.__preview:
+            self.__preview.init(appl)
+
     def reset(self):
         pass
+
+    # Called by pagers when the enabled state might have changed (nothing to display here)
+    def update_enabled(self):
+        return False
     
     # Process a value in range [0..65535]
     def process(self, value):
+        # Smoothing is applied on every call, independent of the frame rate
+        if self.__smoothing > 0:
+            if self.__filter < 0:
+                self.__filter = value << self.__smoothing
+            else:
+                self.__filter += value - (self.__filter >> self.__smoothing)
+
+            value = self.__filter >> self.__smoothing
+
         if self.__period.exceeded:
+            if self.__stats_period.exceeded:
+                self.__stats.set("msgPerSec", self.__num_sent * 1000 // self.__stats_period.interval)
+                self.__num_sent = 0
+
+            # Slow down when the pedal has not been moved for a while
+            if self.__period.interval != self.__idle_interval and self.__idle_period.exceeded:
+                self.__period.interval = self.__idle_interval
+
             # Initial value: Start calibration
             if self.__calibrate:
                 if self.__cal_min == None:
@@ -98,6 +144,13 @@ class AnalogAction(Updateable):
                 # Scale the input value up
                 value = int((value - self.__cal_min) * self.__cal_factor)
                 
+            # Hysteresis: Ignore small changes around the last sent position
+            diff = value - self.__last_input
+            if diff <= self.__hysteresis and diff >= -self.__hysteresis:
+                return
+            
+            self.__last_input = value
+
             # Determine the output value to be sent from the (possibly calibrated) input
             # value in range [0..65535]
             if self.__transfer_function:
@@ -118,6 +171,11 @@ class AnalogAction(Updateable):
                 # Update value on client
                 self.__last_value = v
                 self.__appl.client.set(self.__mapping, v)
+                self.__num_sent += 1
+
+                # Pedal is moving: Use the maximum frame rate
+                self.__idle_period.reset()
+                self.__period.interval = self.__active_interval
 
                 if self.__preview:
                     if not self.__convert_value:
@@ -1,4 +1,6 @@
-from ...misc import Updateable
+from ...misc import Updateable, PeriodCounter, get_current_millis
+from ...stats import Statistics
+from . import EnabledState
 
 from adafruit_midi.system_exclusive import SystemExclusive
 
@@ -25,7 +27,11 @@ class EncoderAction(Updateable):
                  preview_blink_period_millis = 400, # Blink period for preview (if an accept action is set)
                  preview_blink_color = (200, 200, 200), # Alternative color to be used when blinking.
                  preview_reset_mapping = None,      # A parameter mapping (optional) which will be tracked. If the value changes, the preselect mode will be reset.
-                 convert_value = None               # Optional conversion routine for displaying values: (value) => string
+                 convert_value = None,              # Optional conversion routine for displaying values: (value) => string
+                 max_acceleration = None,           # Maximum factor applied to the step width when the encoder is turned fast. 1 disables acceleration.
+                                                    # Set to None for auto-detect (8 for value ranges larger than 1000 like NRPN, else 1).
+                 acceleration_time_millis = 80,     # Detents coming in faster than this are accelerated (linearly up to max_acceleration)
+                 frame_millis = 20                  # Minimum time between two sent/previewed values. Detents coming in faster are coalesced.
         ):
 
         # Set properties automatically by the mapping type if not set manually
@@ -43,17 +49,31 @@ class EncoderAction(Updateable):
         self.id = id
         self._mapping = mapping
 
+        if max_acceleration == None:
+            max_acceleration = 8 if (max_value - min_value) > 1000 else 1
+
         self.__min_value = min_value
         self.__max_value = max_value
         self.__step_width = step_width
-
-        self.__last_pos = -1
+        self.__max_acceleration = max_acceleration
+        self.__acceleration_time = acceleration_time_millis
+
+        self.__last_pos = None
+        self.__last_detent_time = 0
+        self.__fraction = 0                  # Not yet applied fraction of steps
+        self.__pending = False               # Value has changed since it has been sent/previewed last
+        self.__frame_period = PeriodCounter(frame_millis)
         self._last_value = -1
         self.__convert_value = convert_value
 
         self.__enable_callback = enable_callback
         if self.__enable_callback:
             self.__enable_callback.action = self
+            if hasattr(self.__enable_callback, "add_action"):
+                self.__enable_callback.add_action(self)
+            self.__enabled_state = EnabledState(self.__enable_callback)
+        else:
+            self.__enabled_state = None
 
         if accept_action:
             accept_action.callback.register_encoder(self, False)
@@ -77,16 +97,22 @@ class EncoderAction(Updateable):
                 self.__preview_reset_last_value = None
         else:
             self.__preview = None
+
+        # Detents vs. value updates (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Encoder " + repr(id) if id else "Encoder")
                 
     @property
     def enabled(self):
-        return self.__enable_callback.enabled(self) if self.__enable_callback else True
+        return self.__enabled_state.get(self) if self.__enabled_state else True
 
     def init(self, appl):
         self._appl = appl
 
         appl.client.register(self._mapping)
 
+        if self.__preview:
+            self.__preview.init(appl)
+
         # Also register the reset mapping for the preview display
         if self.__preview and self.__preselect and self.__preview_reset_mapping:
             appl.client.register(self.__preview_reset_mapping)
@@ -94,12 +120,13 @@ class EncoderAction(Updateable):
     def update(self):
         self._appl.client.request(self._mapping)
 
-        if self.__preview:
-            self.__preview.update()
-
     def reset(self):
         pass
 
+    # Called by pagers when the enabled state might have changed (nothing to display here)
+    def update_enabled(self):
+        return False
+
     # Override this to scale the incoming mapping values
     def _get_value(self):
         return self._mapping.value
@@ -108,13 +135,19 @@ class EncoderAction(Updateable):
     def _set_value(self, value):
         self._mapping.value = value
 
-    # Process the current encoder position
+    # Process the current encoder position. Values are sent/previewed at most once per frame 
+    # (see frame_millis), the latest value of a frame is sent in the next call after the frame has passed.
     def process(self, position):
-        # Scale by step width
-        position = int(position * self.__step_width)
+        self.__process_position(position)
+
+        if self.__pending and self.__frame_period.exceeded:
+            self.__pending = False
+            self.__value_changed()
 
+    # Calculates the value for the current encoder position
+    def __process_position(self, position):
         # Initialize
-        if self.__last_pos == -1:
+        if self.__last_pos == None:
             self.__last_pos = position
 
         # Reset preview if the reset mapping had a value change
@@ -129,18 +162,24 @@ class EncoderAction(Updateable):
         if self.__last_pos == position:
             return
 
+        self.__stats.add("detents")
+
+        # Get the delta value, scaled by step width and acceleration
+        self.__fraction += (position - self.__last_pos) * self.__step_width * self.__get_acceleration()
+        self.__last_pos = position
+
+        add_value = int(self.__fraction)
+        if add_value == 0:
+            return
+        
+        self.__fraction -= add_value
+
         # No value yet
         if self._get_value() == None:
             self._set_value(0)
             
-        # Get the delta value
-        add_value = position - self.__last_pos
-        #add_value = int((position - self.__last_pos) * self.__step_width)
-
-        self.__last_pos = position
-
         # Get value to set
-        if not self.__preselect:
+        if not self.__preselect and not self.__pending:
             v = self._get_value() + add_value
         else:
             v = self._last_value + add_value
@@ -150,36 +189,55 @@ class EncoderAction(Updateable):
         if v > self.__max_value:
             v = self.__max_value
 
-        # If changed, set or preview the value
         if self._last_value != v:
             self._last_value = v
-            
-            if not self.__preselect:
-                self.accept()
+            self.__pending = True
+
+    # Returns the acceleration factor for the current detent, depending on the time since the last one
+    def __get_acceleration(self):
+        if self.__max_acceleration <= 1:
+            return 1
+        
+        now = get_current_millis()
+        interval = now - self.__last_detent_time
+        self.__last_detent_time = now
+
+        if interval >= self.__acceleration_time:
+            return 1
+        
+        return 1 + (self.__max_acceleration - 1) * (self.__acceleration_time - interval) / self.__acceleration_time
+
+    # Set or preview the changed value
+    def __value_changed(self):
+        v = self._last_value
+        self.__stats.add("updates")
+
+        if not self.__preselect:
+            self.accept()
+        else:
+            self.__preselect_active = True
+
+        if self.__preview:
+            if not self.__convert_value:
+                self.__preview.preview_mapping(
+                    mapping = self._mapping,
+                    value = v,
+                    max_value = self.__max_value,
+                    client = self,
+                    stay = self.__preselect,
+                    timeout_millis = self.__preview_timeout_millis,
+                    blink_interval_millis = self.__blink_interval_millis if self.__preselect else None,
+                    blink_color = self.__blink_color
+                )
             else:
-                self.__preselect_active = True
-
-            if self.__preview:
-                if not self.__convert_value:
-                    self.__preview.preview_mapping(
-                        mapping = self._mapping,
-                        value = v,
-                        max_value = self.__max_value,
-                        client = self,
-                        stay = self.__preselect,
-                        timeout_millis = self.__preview_timeout_millis,
-                        blink_interval_millis = self.__blink_interval_millis if self.__preselect else None,
-                        blink_color = self.__blink_color
-                    )
-                else:
-                    self.__preview.preview(
-                        text = self.__convert_value(v),
-                        client = self,
-                        stay = self.__preselect,
-                        timeout_millis = self.__preview_timeout_millis,
-                        blink_interval_millis = self.__blink_interval_millis if self.__preselect else None,
-                        blink_color = self.__blink_color
-                    )
+                self.__preview.preview(
+                    text = self.__convert_value(v),
+                    client = self,
+                    stay = self.__preselect,
+                    timeout_millis = self.__preview_timeout_millis,
+                    blink_interval_millis = self.__blink_interval_millis if self.__preselect else None,
+                    blink_color = self.__blink_color
+                )
 
     # Send the last value and reset preview display
     def accept(self):
@@ -198,6 +256,7 @@ class EncoderAction(Updateable):
     # Cancel preselection
     def cancel(self, immediately = True):
         self.__preselect_active = False
+        self.__pending = False
 
         self._last_value = self._get_value()
 
@@ -5,6 +5,42 @@ from ...misc import get_option, Updateable, PeriodCounter
 #from ..stats import RuntimeStatistics
 
 
+# Cached enabled state of an action with enable callback. Enable callbacks which publish their changes
+# (by having an attribute publishes_changes = True) must call EnabledState.changed() whenever the enabled 
+# state of any of their actions might have changed. For these, the callback is only asked again after a
+# change has been published. All other enable callbacks are asked on every access.
+class EnabledState:
+
+    # Version of the enabled states, incremented on every published change
+    VERSION = 0
+
+    # Must be called by publishing enable callbacks when enabled states might have changed
+    @staticmethod
+    def changed():
+        EnabledState.VERSION += 1
+
+    def __init__(self, enable_callback):
+        self.__callback = enable_callback
+        self.cacheable = getattr(enable_callback, "publishes_changes", False)
+
+        self.__enabled = True
+        self.__version = -1
+
+    # Returns the enabled state for the action
+    def get(self, action):
+        if not self.cacheable:
+            return self.__callback.enabled(action)
+
+        if self.__version != EnabledState.VERSION:
+            self.__version = EnabledState.VERSION
+            self.__enabled = self.__callback.enabled(action)
+
+        return self.__enabled
+
+
+##########################################################################################################
+
+
 # Base class for actions. All functionality is encapsulated in a class for each, 
 # inheriting from Action.
 class Action(Updateable):
@@ -26,7 +62,9 @@ class Action(Updateable):
     #
     #      "display":              Optional DisplayLabel instance
     #
-    #      "enableCallback":       Callback to set enabled state (optional). Must contain an enabled(action) function.
+    #      "enableCallback":       Callback to set enabled state (optional). Must contain an enabled(action) function. If it publishes
+    #                              its changes, the state is cached (see EnabledState). If it has an add_action(action) function,
+    #                              every action using it is registered there.
     # 
     #      "id":                   Optional ID for debugging. If not set, an automatic ID is generated.
     #
@@ -47,6 +85,11 @@ class Action(Updateable):
         self.__enable_callback = get_option(config, "enableCallback", None)
         if self.__enable_callback:
             self.__enable_callback.action = self
+            if hasattr(self.__enable_callback, "add_action"):
+                self.__enable_callback.add_action(self)
+            self.__enabled_state = EnabledState(self.__enable_callback)
+        else:
+            self.__enabled_state = None
 
         self.__last_enabled = -1
 
@@ -64,7 +107,12 @@ class Action(Updateable):
 
     @property
     def enabled(self):
-        return self.__enable_callback.enabled(self) if self.__enable_callback else True
+        return self.__enabled_state.get(self) if self.__enabled_state else True
+    
+    # Returns if the enabled state can be cached until the next published change (see EnabledState)
+    @property
+    def enabled_cacheable(self):
+        return self.__enabled_state.cacheable if self.__enabled_state else True
         
     # Color of the switch segment(s) for the action (Difficult to do with multicolor, 
     # but this property is just needed to have a setter so this is not callable)
@@ -119,13 +167,22 @@ class Action(Updateable):
 
     # Called regularly every update interval to update status of effects etc.
     def update(self):
-        if self.__last_enabled != self.enabled:
-            self.__last_enabled = self.enabled
+        self.update_enabled()
+
+    # Checks if the enabled state has changed. If so, the callback display state is 
+    # reset and the displays are updated. Returns if the state has changed.
+    def update_enabled(self):
+        enabled = self.enabled
+        if self.__last_enabled == enabled:
+            return False
+        
+        self.__last_enabled = enabled
             
-            if self.callback:
-                self.callback.reset()
+        if self.callback:
+            self.callback.reset()
 
-            self.update_displays()
+        self.update_displays()
+        return True
 
     # Called when the switch is pushed down
     def push(self):
@@ -1,11 +1,13 @@
-from math import floor
 from micropython import const
-from ..misc import EventEmitter, PeriodCounter, Updateable, get_option, do_print
+from ..misc import EventEmitter, PeriodCounter, Updateable, get_option, do_print, get_current_millis
+from ..stats import Statistics
 
 from adafruit_midi.control_change import ControlChange
 from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.program_change import ProgramChange
 
+from .midi import RawMidiMessage
+
 
 # Midi mapping for a client command. Contains commands to set or request a parameter
 class ClientParameterMapping:
@@ -14,7 +16,7 @@ class ClientParameterMapping:
 
     # Singleton factory
     @staticmethod
-    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None, stale_millis = 0):
         if not name:
             raise Exception() # You must provide an unique name!
         
@@ -30,7 +32,8 @@ class ClientParameterMapping:
             response = response,
             value = value,
             type = type,
-            depends = depends
+            depends = depends,
+            stale_millis = stale_millis
         )
 
         ClientParameterMapping._mappings.append(m)
@@ -43,7 +46,7 @@ class ClientParameterMapping:
     PARAMETER_TYPE_STRING = const(1)
 
     # Takes MIDI messages as argument (ControlChange or SystemExclusive)
-    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None, stale_millis = 0):
         if create_key != ClientParameterMapping:
             raise Exception() # Use the get method exclusively to create mappings!
         
@@ -56,6 +59,10 @@ class ClientParameterMapping:
         self.type = type          # Numeric or string
         self.depends = depends    # If another mapping is set here, this mapping will only be requested when the dependency has changed value
                                   # NOTE: In 2.4.1, this is prepared but not realized already
+        self.stale_millis = stale_millis  # If set, the value is not requested again for this amount of milliseconds after it has been received
+        self.received_time = 0    # Time when the value has been received last (only set if stale_millis is set)
+
+        self.__raw_sets = None    # SysEx SET message -> [raw message, value offset] (created on first usage)
 
     # Parse the incoming MIDI message and set its value on the mapping.
     # If the response template does not match, returns False, and
@@ -154,21 +161,49 @@ class ClientParameterMapping:
             midi_message.value = value
 
         elif isinstance(midi_message, SystemExclusive):            
-            # Fill up message to appropriate length for the specification
-            data = list(midi_message.data)
-            while len(data) < 8:
-                data.append(0)
-            
-            # Set value as 14 bit
-            data[6] = int(floor(value / 128))
-            data[7] = int(value % 128)
+            raw = self.__get_raw_set(midi_message)
+            data = raw[0].data
+            offset = raw[1]
+            value = int(value)
 
-            midi_message.data = bytes(data)
+            # Set value as 14 bit in the raw message buffer
+            data[offset] = value >> 7
+            data[offset + 1] = value & 0x7f
 
         elif isinstance(midi_message, ProgramChange):
             # Set patch
             midi_message.patch = value
 
+    # Returns the raw message (RawMidiMessage, including start and end bytes) holding the current 
+    # value for a SysEx SET message of the mapping, or None if the message is no SysEx message.
+    def raw_set(self, midi_message):
+        if not isinstance(midi_message, SystemExclusive):
+            return None
+        
+        return self.__get_raw_set(midi_message)[0]
+
+    # Creates the raw message for a SysEx SET message once. Its buffer is filled up to the appropriate 
+    # length for the specification, so values can be set in place. The SET message itself is not changed.
+    def __get_raw_set(self, midi_message):
+        if not self.__raw_sets:
+            self.__raw_sets = {}
+
+        raw = self.__raw_sets.get(midi_message, None)
+        if raw:
+            return raw
+        
+        data = bytearray(midi_message.data)
+        while len(data) < 8:
+            data.append(0)
+
+        raw = [
+            RawMidiMessage(bytearray(b"\xf0") + bytearray(midi_message.manufacturer_id) + data + bytearray(b"\xf7")),
+            1 + len(midi_message.manufacturer_id) + 6
+        ]
+        self.__raw_sets[midi_message] = raw
+
+        return raw
+
     # Returns if the mapping has finished receiving a result. Per default,
     # this returns True which is valid for mappings with one response.
     def result_finished(self):
@@ -178,18 +213,22 @@ class ClientParameterMapping:
     #     return self.name
     
 
-# Parser for two-part messages: The result value will be 128 * value1 + value2, 
-# notified when the second message arrives.
-class ClientTwoPartParameterMapping(ClientParameterMapping):
+# Parser for values which are sent in multiple messages (parts), for example 14 bit values split into
+# two CC messages, NRPN sequences (CC 99/98/6/38) or strings sent in chunks. The response of the mapping
+# has to be a list of template messages, one for each part, which are expected in order. The parts are
+# assembled by a state machine without buffering messages: Numeric values are shifted in (with part_bits
+# bits per part, so the result of two parts will be 128 * value1 + value2), strings are concatenated.
+# Listeners are notified when the last part arrives.
+class ClientMultiPartParameterMapping(ClientParameterMapping):
 
     # Singleton factory
     @staticmethod
-    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None):
+    def get(name, set = None, request = None, response = None, value = None, type = 0, depends = None, stale_millis = 0, address_parts = None, part_bits = 7, timeout_millis = 0):
         for m in ClientParameterMapping._mappings:
             if m.name == name:
                 return m
             
-        m = ClientTwoPartParameterMapping(
+        m = ClientMultiPartParameterMapping(
             name = name,
             create_key = ClientParameterMapping,
             set = set,
@@ -197,57 +236,153 @@ class ClientTwoPartParameterMapping(ClientParameterMapping):
             response = response,
             value = value,
             type = type,
-            depends = depends
+            depends = depends,
+            stale_millis = stale_millis,
+            address_parts = address_parts,
+            part_bits = part_bits,
+            timeout_millis = timeout_millis
         )
 
         ClientParameterMapping._mappings.append(m)
         return m
+    
+    # Singleton factory for NRPN parameters: The parameter number is sent with CC 99 (MSB) and 98 (LSB), 
+    # the value with CC 6 (MSB) and 38 (LSB).
+    @staticmethod
+    def get_nrpn(name, parameter, set = None, request = None, value = None, depends = None, stale_millis = 0, timeout_millis = 100):
+        return ClientMultiPartParameterMapping.get(
+            name = name,
+            set = set,
+            request = request,
+            response = [
+                ControlChange(99, parameter >> 7),
+                ControlChange(98, parameter & 0x7f),
+                ControlChange(6, 0),
+                ControlChange(38, 0)
+            ],
+            value = value,
+            depends = depends,
+            stale_millis = stale_millis,
+            address_parts = (0, 1),
+            timeout_millis = timeout_millis
+        )
 
     ##########################################################################################################################
 
-    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None):
-        super().__init__(name = name, create_key = create_key, set = set, request = request, response = response, value = value, type = type, depends = depends)
-
-        self.__value_1 = None
+    # address_parts:  Indexes of parts which do not contain a part of the value, but an address which must match 
+    #                 the value of the template message (CC value or PC patch). Optional.
+    # part_bits:      Bits per numeric value part. Default is 7 (MIDI data bytes).
+    # timeout_millis: If set, a partially received value is discarded when the next part does not arrive in time.
+    def __init__(self, name, create_key, set = None, request = None, response = None, value = None, type = 0, depends = None, stale_millis = 0, address_parts = None, part_bits = 7, timeout_millis = 0):
+        super().__init__(name = name, create_key = create_key, set = set, request = request, response = response, value = value, type = type, depends = depends, stale_millis = stale_millis)
+
+        self.__num_parts = len(response)
+        self.__part_bits = part_bits
+        self.__timeout = timeout_millis
+
+        # Expected address values per part (None for value parts)
+        self.__addresses = [None for _ in range(self.__num_parts)]
+        if address_parts:
+            for i in address_parts:
+                self.__addresses[i] = self.__get_template_value(response[i])
+
+        self.__index = 0          # Index of the next expected part
+        self.__accu = None        # Value assembled so far
+        self.__part_time = 0      # Time when the last part has been received (only set if a timeout is set)
     
-    def parse(self, midi_message): 
-        value_1 = self.parse_against(midi_message, self.response[0])
-        if value_1 != None:
-            self.__value_1 = value_1
-            return True
-        
-        value_2 = self.parse_against(midi_message, self.response[1])
+    def parse(self, midi_message):
+        index = self.__index
 
-        if value_2 != None and self.__value_1 != None:
-            self.value = 128 * self.__value_1 + value_2
-            self.__value_1 = None
+        # Discard partial values which timed out
+        if index > 0 and self.__timeout and get_current_millis() - self.__part_time > self.__timeout:
+            index = self.__index = 0
+
+        if self.__parse_part(midi_message, index):
             return True
         
+        # A new value may start before the current one has been completed
+        if index > 0:
+            return self.__parse_part(midi_message, 0)
+        
         return False
             
     def result_finished(self):
-        return (self.__value_1 == None)
+        return (self.__index == 0)
+    
+    # Parses the message as part with the given index. Returns if the message has been consumed.
+    def __parse_part(self, midi_message, index):
+        value = self.parse_against(midi_message, self.response[index])
+        if value == None:
+            return False
+        
+        address = self.__addresses[index]
+        if address != None and value != address:
+            return False
+
+        if index == 0:
+            self.__accu = "" if self.type == self.PARAMETER_TYPE_STRING else 0
+
+        if address == None:
+            if self.type == self.PARAMETER_TYPE_STRING:
+                self.__accu += value
+            else:
+                self.__accu = (self.__accu << self.__part_bits) + value
+
+        index += 1
+
+        if index < self.__num_parts:
+            self.__index = index
+
+            if self.__timeout:
+                self.__part_time = get_current_millis()
+        else:
+            self.__index = 0
+            self.value = self.__accu
+
+        return True
+
+    # Returns the address value of a template message
+    def __get_template_value(self, midi_message):
+        if isinstance(midi_message, ControlChange):
+            return midi_message.value
+        
+        if isinstance(midi_message, ProgramChange):
+            return midi_message.patch
+        
+        raise Exception() # Address parts must be CC or PC messages
+
+
+# Two-part messages: The result value will be 128 * value1 + value2 (kept for compatibility)
+ClientTwoPartParameterMapping = ClientMultiPartParameterMapping
 
 
 ############################################################################################################
 
 
+# Request priorities (lower values are sent first)
+_PRIORITY_VISIBLE = const(0)     # Listeners with a display label, or no action at all
+_PRIORITY_LEDS = const(1)        # Enabled actions without display label (LEDs only)
+_PRIORITY_HIDDEN = const(2)      # Disabled actions (for example on other pages)
+
+# Queued requests gain one priority level each time they have been passed over this many times, so
+# requests of hidden actions cannot starve.
+_PRIORITY_AGING = const(4)
+
+
 # Implements all MIDI communication to and from the client device
 class Client: #(ClientRequestListener):
 
     # Listener for dependency mappings
     class _DependencyListener:
         def __init__(self, client, orig_mapping, listener = None):
-            self.__client = client
-            self.__orig_mapping = orig_mapping
-            self.__last_value = None
-            self.__listener = listener
+            self.client = client
+            self.orig_mapping = orig_mapping
+            self.last_value = None
+            self.listener = listener
 
         def parameter_changed(self, mapping):
-            if mapping.value != self.__last_value:
-                self.__last_value = mapping.value
-
-                self.__client._register_mapping(self.__orig_mapping, self.__listener, True)           
+            if mapping.value != self.last_value:
+                self.client._dependency_changed(mapping)
         
         def request_terminated(self, mapping):
             pass
@@ -266,9 +401,12 @@ class Client: #(ClientRequestListener):
         if self.__debug_stats:   # pragma: no cover 
             self.__stats_period = PeriodCounter(get_option(config, "debugStatsInterval", 2000))
 
-        # List of ClientRequest objects    
+        # List of active ClientRequest objects    
         self.__requests = []
 
+        # Finished ClientRequest objects, which are recycled for new requests
+        self.__free_requests = []
+
         # Dict of dependency listeners
         self.__dependencies = {}
 
@@ -277,10 +415,32 @@ class Client: #(ClientRequestListener):
         # Helper to only clean up hanging requests from time to time as this is not urgent at all
         self.__cleanup_terminated_period = PeriodCounter(self.__max_request_lifetime / 2)    
 
+        # Request planner: If a budget is set, request messages are not sent immediately but queued, and sent 
+        # evenly spread over the update interval, at most the budget per update interval.
+        max_requests_per_update = get_option(config, "maxRequestsPerUpdate", 0)
+        if max_requests_per_update > 0:
+            self.__send_queue = []
+            self.__send_period = PeriodCounter(get_option(config, "updateInterval", 200) / max_requests_per_update)
+        else:
+            self.__send_queue = None
+
+        # Mappings re-requested after the last dependency change, and the time of the change
+        self.__prefetch_mappings = None
+        self.__prefetch_start = 0
+
+        # Time until all values have been received after a dependency change, like a rig change (shown when 
+        # the debugStats option is enabled)
+        self.__prefetch_stats = Statistics("Dependency prefetch")
+
     @property
     def requests(self):
         return self.__requests
 
+    # Called by the controller when all mappings of the configuration have been registered,
+    # before processing starts.
+    def init(self):
+        pass
+
     # Register the mapping and listener in advance (only plays a role for bidirectional parameters,
     # here this is redundant)
     def register(self, mapping, listener = None):
@@ -299,15 +459,21 @@ class Client: #(ClientRequestListener):
                 if not m:
                     continue
 
-                if self.__debug_sent_messages:   # pragma: no cover
-                    self.print_message(m)
-
-                self.midi.send(m)
+                self.__send_set(mapping, m)
         else:
-            if self.__debug_sent_messages:       # pragma: no cover
-                self.print_message(mapping.set)
-                
-            self.midi.send(mapping.set)
+            self.__send_set(mapping, mapping.set)
+
+    # Sends a SET message. SysEx messages are sent as raw messages holding the current value, 
+    # so they are not serialized by adafruit_midi.
+    def __send_set(self, mapping, midi_message):
+        raw = mapping.raw_set(midi_message)
+        if raw:
+            midi_message = raw
+
+        if self.__debug_sent_messages:       # pragma: no cover
+            self.print_message(midi_message)
+
+        self.midi.send(midi_message)
 
     # Send the request message of a mapping. Calls the passed listener when the answer has arrived.
     #@RuntimeStatistics.measure
@@ -315,6 +481,10 @@ class Client: #(ClientRequestListener):
         if not mapping.request or not mapping.response:
             return
         
+        # Value is still fresh enough
+        if mapping.stale_millis and mapping.value != None and get_current_millis() - mapping.received_time < mapping.stale_millis:
+            return
+
         if mapping.depends:
             if not mapping in self.__dependencies:
                 self.__dependencies[mapping] = self._DependencyListener(self, mapping, listener)
@@ -324,6 +494,34 @@ class Client: #(ClientRequestListener):
         else:
             self._register_mapping(mapping, listener, True)
         
+    # Called by the dependency listeners when the value of a dependency mapping (for example the rig date) has 
+    # changed. All cached values are invalidated at once, and all mappings depending on it are requested again
+    # in order of priority: Visible labels first, then LED-only actions, then actions on hidden pages. Internal use only.
+    def _dependency_changed(self, dependency):
+        plan = []
+        for d in self.__dependencies.values():
+            if d.orig_mapping.depends != dependency or d.last_value == dependency.value:
+                continue
+
+            d.last_value = dependency.value
+            plan.append(d)
+
+        if not plan:
+            return
+        
+        # Invalidate the cached values (see stale_millis) of the affected mappings, as they belong to the old state
+        for d in plan:
+            d.orig_mapping.received_time = 0
+
+        plan.sort(key = lambda d: self.__get_listener_priority(d.listener))
+
+        for d in plan:
+            self._register_mapping(d.orig_mapping, d.listener, True)
+
+        self.__prefetch_mappings = [d.orig_mapping for d in plan]
+        self.__prefetch_start = get_current_millis()
+        self.__prefetch_stats.add("changes")
+
     # Registers a mapping request or adds the listener to an existing one. Optionally sends the
     # request message. Internal use only.
     def _register_mapping(self, mapping, listener, send):
@@ -340,21 +538,26 @@ class Client: #(ClientRequestListener):
             self.__requests.append(req)
             
             # Send 
-            if send:           
-                req.send()
+            if send:
+                if self.__send_queue != None:
+                    self.__send_queue.append(req)
+                else:
+                    req.send()
 
         else:
             # Existing request: Add listener
             if listener:
                 req.add_listener(listener)
 
-    # Create a new request
+    # Create a new request (recycles a finished one if available)
     def __create_request(self, mapping):
-        return ClientRequest(              
-            self,
+        req = self.__free_requests.pop() if self.__free_requests else ClientRequest(self)
+
+        req.activate(
             mapping,
             self.__max_request_lifetime if mapping.request else 0
         )
+        return req
 
     # Receive MIDI messages
     #@RuntimeStatistics.measure
@@ -362,8 +565,11 @@ class Client: #(ClientRequestListener):
         if self.__cleanup_terminated_period.exceeded:
             self.__cleanup_hanging_requests()
 
+        if self.__send_queue and self.__send_period.exceeded:
+            self.__send_next_request()
+
         if self.__debug_stats and self.__stats_period.exceeded:  # pragma: no cover 
-            do_print(f"    { len(self.__requests) } requests pending:")
+            do_print(f"    { len(self.__requests) } requests pending ({ len(self.__free_requests) } pooled, { len(self.__send_queue) if self.__send_queue else 0 } queued):")
             for r in self.__requests:
                 do_print(f"{ r.mapping.name }: { repr([l.__class__.__name__ for l in r.listeners]) }")
 
@@ -385,6 +591,9 @@ class Client: #(ClientRequestListener):
         if do_cleanup:
             self.__cleanup_requests()
 
+            if self.__prefetch_mappings:
+                self.__check_prefetch()
+
         # Debug unparsed messages
         if not parsed and self.debug_unparsed_messages:           # pragma: no cover
             self.print_message(midi_message)
@@ -401,15 +610,91 @@ class Client: #(ClientRequestListener):
             
         return None
 
-    # Remove all finished requests, and terminate the ones which took too long already
+    # Sends the next queued request with the highest priority (see __get_priority). The priority 
+    # of the requests left in the queue is raised over time (see _PRIORITY_AGING).
+    def __send_next_request(self):
+        queue = self.__send_queue
+
+        index = 0
+        priority = _PRIORITY_HIDDEN + 1
+
+        for i in range(len(queue)):
+            request = queue[i]
+            p = self.__get_priority(request) - request.skipped // _PRIORITY_AGING
+            if p < priority:
+                index = i
+                priority = p
+
+                if p <= _PRIORITY_VISIBLE:
+                    break
+            
+        queue.pop(index).send()
+
+        for request in queue:
+            request.skipped += 1
+
+    # Returns the priority of a request, which is the highest priority of its listeners
+    def __get_priority(self, request):
+        priority = _PRIORITY_HIDDEN
+
+        for listener in request.listeners:
+            p = self.__get_listener_priority(listener)
+            if p < priority:
+                priority = p
+            
+        return priority
+    
+    # Returns the priority of a listener: Callbacks of disabled actions (for example on other pages) 
+    # come last, before them callbacks of actions only using LEDs.
+    def __get_listener_priority(self, listener):
+        action = getattr(listener, "action", None)
+        if not action:
+            return _PRIORITY_VISIBLE
+        
+        if not action.enabled:
+            return _PRIORITY_HIDDEN
+        
+        return _PRIORITY_VISIBLE if action.label else _PRIORITY_LEDS
+
+    # Checks if all mappings requested after the last dependency change have been received (or terminated)
+    def __check_prefetch(self):
+        for mapping in self.__prefetch_mappings:
+            if self.get_matching_request(mapping):
+                return
+            
+        duration = get_current_millis() - self.__prefetch_start
+        self.__prefetch_mappings = None
+
+        self.__prefetch_stats.set("lastMs", duration)
+        self.__prefetch_stats.max("maxMs", duration)
+
+    # Remove all finished requests (the last one in the list takes the place of the removed one) and
+    # put them to the pool for later reuse.
     def __cleanup_requests(self):
-        self.__requests = [i for i in self.__requests if not i.finished]
+        requests = self.__requests
+
+        i = len(requests) - 1
+        while i >= 0:
+            request = requests[i]
+
+            if request.finished:
+                last = requests.pop()
+                if i < len(requests):
+                    requests[i] = last
+
+                self.__free_requests.append(request)
+
+                # Finished before being sent
+                if self.__send_queue and request in self.__send_queue:
+                    self.__send_queue.remove(request)
+            
+            i -= 1
             
     # Terminate any requests which took too long from time to time
     def __cleanup_hanging_requests(self):
-        # Terminate requests if they waited too long
+        # Terminate requests if they waited too long for an answer (requests still waiting in the send queue are skipped)
         for request in self.__requests:
-            if request.lifetime and request.lifetime.exceeded:
+            if request.lifetime and request.sent and request.lifetime.exceeded:
                 request.terminate()
 
         self.__cleanup_requests()
@@ -426,31 +711,54 @@ class Client: #(ClientRequestListener):
 #######################################################################################################################
 
 
-# Model for a request for a value
+# Model for a request for a value. Requests are recycled by the client: activate() must be called 
+# before usage.
 class ClientRequest(EventEmitter):
 
-    def __init__(self, client, mapping, max_request_lifetime = 0):
+    def __init__(self, client):
         super().__init__() #ClientRequestListener)
         
         self.client = client
-        self.mapping = mapping
+        self.mapping = None
+        self.lifetime = None
+        self.sent = False              # Has the request message been sent?
+        self.skipped = 0               # Number of times the request has been passed over in the send queue
         
-        self.lifetime = self.__init_lifetime(max_request_lifetime)
+        self.__lifetime_period = None
+        self.__finished = True
 
-    # Sets up the lifetime for mappings not belonging to a bidirectional protocol
-    def __init_lifetime(self, max_request_lifetime):
-        if not max_request_lifetime > 0:            
-            return None
-            
-        lifetime = PeriodCounter(max_request_lifetime)
-        lifetime.reset()
+    # Prepares the request for a mapping. Lifetime is only used for mappings not belonging to a 
+    # bidirectional protocol (pass 0 for unlimited lifetime). It starts when the request is sent.
+    def activate(self, mapping, max_request_lifetime = 0):
+        self.mapping = mapping
+        self.sent = False
+        self.skipped = 0
+        self.__finished = False
 
-        return lifetime
+        if max_request_lifetime > 0:
+            if not self.__lifetime_period:
+                self.__lifetime_period = PeriodCounter(max_request_lifetime)
+            else:
+                self.__lifetime_period.interval = int(max_request_lifetime)
+
+            self.lifetime = self.__lifetime_period
+        else:
+            self.lifetime = None
+
+    # Clears the listeners (the list is kept for reuse) and marks the request as finished
+    def __finish(self):
+        self.listeners.clear()
+        self.__finished = True
 
     # Sends the request
     def send(self):
         if not self.mapping.request:
             return
+        
+        # Lifetime starts when the request is actually sent
+        self.sent = True
+        if self.lifetime:
+            self.lifetime.reset()
 
         if isinstance(self.mapping.request, list):
             for m in self.mapping.request:
@@ -463,7 +771,7 @@ class ClientRequest(EventEmitter):
     # Returns if the request is finished
     @property
     def finished(self):
-        return self.listeners == None
+        return self.__finished
 
     # Send the terminate signal to all listeners and finished it, so it will be
     # cleared up next time.
@@ -475,7 +783,7 @@ class ClientRequest(EventEmitter):
         self.notify_terminated()
 
         # Clear listeners
-        self.listeners = None
+        self.__finish()
 
     # Parses an incoming MIDI message. If the message belongs to the mapping's request,
     # calls the listener with the received value. Returns if the message has been used.
@@ -493,6 +801,9 @@ class ClientRequest(EventEmitter):
 
         if not mapping.result_finished():
             return
+        
+        if mapping.stale_millis:
+            mapping.received_time = get_current_millis()
 
         if self.client.debug_mapping == mapping:    # pragma: no cover
             from ..debug_tools import stringify_midi_message
@@ -504,7 +815,7 @@ class ClientRequest(EventEmitter):
 
         # Clear listeners (only if the request has a restricted life time)
         if self.lifetime:
-            self.listeners = None
+            self.__finish()
 
         return True
 
@@ -529,17 +840,48 @@ class BidirectionalClient(Client, Updateable):
         self.protocol.debug = get_option(config, "debugBidirectionalProtocol")
         self.protocol.init(midi, self)
 
+        # Registrations are collected until init() is called, so the protocol can choose what to
+        # receive bidirectionally from all mappings used by the configuration.
+        self.__pending_registrations = []
+
+    # Called by the controller when all mappings have been registered
+    def init(self):
+        if self.__pending_registrations == None:
+            return
+        
+        pending = self.__pending_registrations
+        self.__pending_registrations = None
+
+        self.protocol.select_parameters([r[0] for r in pending])
+
+        for r in pending:
+            self.__register(r[0], r[1])
+
     # Register the mapping and listener in advance (only plays a role for bidirectional parameters)
     def register(self, mapping, listener = None):
+        if self.__pending_registrations != None:
+            self.__pending_registrations.append((mapping, listener))
+        else:
+            self.__register(mapping, listener)
+
+    def __register(self, mapping, listener):
         if self.protocol.is_bidirectional(mapping):
             mapping.request = None
             mapping.depends = None
+
+            # Late registrations (after init) may use parameters the protocol has chosen to discard
+            if self.__pending_registrations == None:
+                self.protocol.use(mapping)
     
         Client.register(self, mapping, listener)
         
     # Receive messages (also passes messages to the protocol)
     #@RuntimeStatistics.measure
     def receive(self, midi_message):
+        # Messages for parameters which are pushed by the client but not used are dropped right away
+        if self.protocol.discard(midi_message):
+            return False
+        
         # Dirty hack to disable the debugging of unparsed messages in the Client implementation
         tmp = self.debug_unparsed_messages
         self.debug_unparsed_messages = False
@@ -612,6 +954,20 @@ class BidirectionalClient(Client, Updateable):
 #    def init(self, midi, client):
 #        pass
 #
+#    # Called once with all mappings registered by the configuration, before processing starts.
+#    # The protocol can use this to restrict the bidirectionally handled parameters.
+#    def select_parameters(self, mappings):
+#        pass
+#
+#    # Called for every bidirectional mapping registered after select_parameters(), so the protocol
+#    # can stop discarding its values.
+#    def use(self, mapping):
+#        pass
+#
+#    # Must return (boolean) if the passed message can be dropped without further parsing
+#    def discard(self, midi_message):
+#        return False
+#
 #    # Must return (boolean) if the passed mapping is handled in the bidirectional protocol
 #    def is_bidirectional(self, mapping):
 #        return False
@@ -0,0 +1,70 @@
+from gc import mem_alloc, mem_free
+from ..misc import PeriodCounter, get_current_millis, collect_garbage, get_num_collections
+from ..stats import Statistics
+
+
+# Schedules garbage collection in idle windows (no switch held, no MIDI pending), before
+# the heap runs so low that CircuitPython has to collect in the middle of a switch push or MIDI burst.
+class CollectScheduler:
+
+    def __init__(self,
+                 headroom_bytes = 1024 * 16,     # Free memory to keep available. When less is free, collection is done in the next idle window.
+                 min_interval_millis = 1000      # Minimum time between scheduled collections
+        ):
+        self.__headroom = headroom_bytes
+        self.__period = PeriodCounter(min_interval_millis)
+
+        self.__last_alloc = mem_alloc()
+        self.__last_num_collections = get_num_collections()
+        self.__alloc_rate = 0                    # Average allocated bytes per tick (moving average)
+
+        # Pause times and collection counts (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Garbage collection")
+
+    # Must be called once per tick. idle tells if there currently is time for a collection.
+    def tick(self, idle):
+        alloc = mem_alloc()
+        delta = alloc - self.__last_alloc
+        self.__last_alloc = alloc
+
+        num_collections = get_num_collections()
+        intentional = num_collections != self.__last_num_collections
+        self.__last_num_collections = num_collections
+
+        if delta < 0:
+            if intentional:
+                # Collected by collect_garbage() somewhere else (for example when a display element is initialized)
+                self.__stats.add("intentional")
+            else:
+                # Memory has been freed without us: CircuitPython collected because an allocation failed
+                self.__stats.add("forced")
+            return
+
+        self.__alloc_rate += (delta - self.__alloc_rate) >> 3
+
+        if not idle:
+            return
+
+        # Keep the headroom plus the memory needed for the next few ticks
+        if mem_free() > self.__headroom + (self.__alloc_rate << 3):
+            return
+
+        if not self.__period.exceeded:
+            return
+
+        self.collect()
+        self.__stats.add("scheduled")
+
+    # Collects garbage immediately
+    def collect(self):
+        start = get_current_millis()
+
+        collect_garbage()
+
+        duration = get_current_millis() - start
+        self.__last_alloc = mem_alloc()
+        self.__last_num_collections = get_num_collections()
+
+        self.__stats.set("lastPauseMs", duration)
+        self.__stats.max("maxPauseMs", duration)
+        self.__stats.set("allocPerTick", self.__alloc_rate)
@@ -1,9 +1,9 @@
-from gc import collect, mem_free
+from gc import mem_free
 
 from .inputs import SwitchController, ContinuousController
 from .client import Client, BidirectionalClient
-from ..misc import Updater, PeriodCounter, get_option, do_print, format_size, fill_up_to
-from ..stats import Memory #, RuntimeStatistics
+from ..misc import Updater, PeriodCounter, get_option, do_print, format_size, fill_up_to, collect_garbage
+from ..stats import Memory, Statistics, Allocations #, RuntimeStatistics
 
 
 # Main application class (controls the processing)    
@@ -31,7 +31,7 @@ class Controller(Updater): #ClientRequestListener
     #                },
     #                ...
     #           ]
-    def __init__(self, led_driver, midi, protocol = None, config = {}, inputs = [], ui = None, period_counter = None):
+    def __init__(self, led_driver, midi, protocol = None, config = {}, inputs = [], ui = None, period_counter = None, latency_tracer = None):
         Updater.__init__(self)
 
         # Flag which is used by display elements to show the user there is not enough memory left
@@ -61,6 +61,22 @@ class Controller(Updater): #ClientRequestListener
             self.__measurement_process_jitter.add_listener(self)
             self.add_updateable(self.__measurement_process_jitter)            
 
+        # Allocation accounting per subsystem
+        if get_option(config, "debugAllocations", False):
+            self.__allocations = Allocations()
+            self.__allocations_period = PeriodCounter(get_option(config, "debugStatsInterval", update_interval))
+            self.__alloc_index_inputs = self.__allocations.add("Inputs")
+            self.__alloc_index_receive = self.__allocations.add("MIDI receive")
+            self.__alloc_indices = {}                 # Updateable -> subsystem index
+        else:
+            self.__allocations = None
+
+        # Optional LatencyTracer for latencies from switch edges to sent MIDI messages. This must be the same
+        # instance which has been passed to the MidiController (see process.py and the debugLatency option).
+        self.latency_tracer = latency_tracer
+        if latency_tracer:
+            self.__latency_period = PeriodCounter(get_option(config, "debugStatsInterval", update_interval))
+
         # Limit of minimum free memory before low_memory_warning is set to True (the check is done before ticks
         # are running so this should be enough to operate all configurations imaginable. Normally you need about 
         # 10-15k from there, so 25k is enough headroom)
@@ -69,6 +85,18 @@ class Controller(Updater): #ClientRequestListener
         # Clear MIDI buffers on startup
         self.__clear_buffer = get_option(config, "clearBuffers", True)
 
+        # Optional garbage collection in idle windows (by default, CircuitPython decides when to collect)
+        gc_headroom = get_option(config, "gcHeadroomBytes", 0)
+        if gc_headroom > 0:
+            from .collector import CollectScheduler
+
+            self.__collector = CollectScheduler(
+                headroom_bytes = gc_headroom,
+                min_interval_millis = get_option(config, "gcMinIntervalMillis", 1000)
+            )
+        else:
+            self.__collector = None
+
         # Global shared data (some actions/callbacks use this)
         self.shared = {}
 
@@ -111,6 +139,8 @@ class Controller(Updater): #ClientRequestListener
                 # It is a continuous input or rotary encoder. 
                 self.inputs.append(ContinuousController(self, sw_def))
 
+        self.__switches = [i for i in self.inputs if isinstance(i, SwitchController)]
+
         # Set up the screen elements
         if self.ui:
             self.ui.init(self)
@@ -124,10 +154,13 @@ class Controller(Updater): #ClientRequestListener
 
             self.ui.show()           
         
+        # All mappings are registered now
+        self.client.init()
+
         Memory.watch("Application loaded")
 
         # Check memory usage and issue a warning if too high
-        collect()
+        collect_garbage()
         if mem_free() < self.__memory_warn_limit:
             do_print(f"LOW MEMORY: { format_size(mem_free()) }")
             self.low_memory_warning = True
@@ -147,22 +180,59 @@ class Controller(Updater): #ClientRequestListener
                 # Receive MIDI messages in between updates, too
                 self.__receive_midi_messages()
 
-                u.update()
+                if self.__allocations:
+                    self.__allocations.start()
+                    u.update()
+                    self.__allocations.finish(self.__get_allocation_index(u))
+                else:
+                    u.update()
 
             Memory.watch("Controller: update", only_if_changed = True)
 
         # Receive all available MIDI messages
-        self.__receive_midi_messages()
+        midi_pending = self.__receive_midi_messages()
+
+        if self.__allocations:
+            self.__allocations.tick()
+
+            if self.__allocations_period.exceeded:
+                self.__allocations.print_top()
+
+        if self.latency_tracer and self.__latency_period.exceeded:
+            self.latency_tracer.print()
+
+        # Collect garbage if necessary, but only when there is nothing else to do
+        if self.__collector:
+            self.__collector.tick(not midi_pending and not self.__switch_held())
 
         return True
 
+    # Returns the allocation accounting index for an updateable. All updateables of the same class
+    # are accounted as one subsystem (for example all actions of one type).
+    def __get_allocation_index(self, u):
+        if not u in self.__alloc_indices:
+            name = u.__class__.__name__
+            names = self.__allocations.names
+
+            self.__alloc_indices[u] = names.index(name) if name in names else self.__allocations.add(name)
+
+        return self.__alloc_indices[u]
+
+    # Returns if any switch is currently held down
+    def __switch_held(self):
+        for switch in self.__switches:
+            if switch.pushed_state:
+                return True
+        return False
+
     # Resets all actions (which refreshes their buffer memories, triggering re-rendering of LEDs and displays)
     def reset_actions(self):
         for input in self.inputs:
             for action in input.actions:
                 action.reset()
 
-    # Receive MIDI messages, and in between check for switch state changes
+    # Receive MIDI messages, and in between check for switch state changes. Returns if there 
+    # still are messages pending.
     def __receive_midi_messages(self):
         cnt = 0
         
@@ -170,26 +240,46 @@ class Controller(Updater): #ClientRequestListener
             if self.__debug_stats:
                 self.__measurement_process_jitter.finish()
             
+            if self.__allocations:
+                self.__allocations.start()
+
             # Detect switch state changes
             for input in self.inputs:
                 input.process()
             
+            if self.__allocations:
+                self.__allocations.finish(self.__alloc_index_inputs)
+
             if self.__debug_stats:
                 self.__measurement_process_jitter.start()
 
+            if self.__allocations:
+                self.__allocations.start()
+
             # Receive MIDI
             midimsg = self.__midi.receive()
             self.client.receive(midimsg)
 
+            if self.__allocations:
+                self.__allocations.finish(self.__alloc_index_receive)
+
             # Break after a certain amount of messages to keep the device responsive
             cnt = cnt + 1
-            if not midimsg or cnt > self.__max_consecutive_midi_msgs:
-                break  
+            if not midimsg:
+                return False
+            
+            if cnt > self.__max_consecutive_midi_msgs:
+                return True
 
         #self._measurement_midi_jitter.start()
 
     # Callback called when the measurement wants to show something
     def measurement_updated(self, measurement):
-        collect()
+        if self.__collector:
+            self.__collector.collect()
+        else:
+            collect_garbage()
         do_print(f"{ fill_up_to(str(measurement.name), 30, '.') }: Max { repr(measurement.value) }ms, Avg { repr(measurement.average) }ms, Calls: { repr(measurement.calls) }, Free: { format_size(mem_free()) }")
 
+        Statistics.print_all()
+
@@ -1,4 +1,5 @@
 from ..misc import get_option, PeriodCounter, Updateable
+from .actions import EnabledState
 from ..colors import Colors
 from array import array
 
@@ -54,6 +55,13 @@ class SwitchController:
             self.__appl.add_updateable(action)            
             action.update_displays()
 
+        # Enabled states of the actions as bitmaps (bit n is set when action n is enabled). These are only 
+        # evaluated again when a change has been published (see EnabledState), if possible for all actions.
+        self.__cache_enabled = all([a.enabled_cacheable for a in self.__actions + self.__actions_hold])
+        self.__enabled_version = -1
+        self.__enabled_bits = 0
+        self.__enabled_bits_hold = 0
+
         # Hold period counter
         self.__period_hold = period_counter_hold
         if not self.__period_hold:
@@ -66,11 +74,26 @@ class SwitchController:
 
         # Sort order for the strobe tuner
         self.strobe_order = get_option(config["assignment"], "strobeOrder", 0)
+
+        # Latency tracing (see debugLatency option)
+        self.__tracer = getattr(appl, "latency_tracer", None)
+        if self.__tracer:
+            self.__tracer_index = self.__tracer.add(get_option(config["assignment"], "name", repr(len(self.__tracer.names) + 1)))
         
     # Process the switch: Check if it is currently pushed, set state accordingly
     def process(self):
-        # Is the switch currently pushed?
-        if not self.pushed:
+        # Is the switch currently pushed? (the hardware is only read once per tick)
+        pushed = self.pushed
+
+        if self.__tracer and pushed != self.__pushed_state:
+            self.__tracer.edge(self.__tracer_index)
+            self.__process(pushed)
+            self.__tracer.finish()
+        else:
+            self.__process(pushed)
+
+    def __process(self, pushed):
+        if not pushed:
             if self.__pushed_state:
                 self.__pushed_state = False
 
@@ -88,14 +111,17 @@ class SwitchController:
                             self.__hold_was_active = False
                             return
 
-                    for action in self.__actions:
-                        if not action.enabled:
+                    actions = self.__actions
+                    enabled = self.__get_enabled_bits()
+
+                    for i in range(len(actions)):
+                        if not enabled & (1 << i):
                             continue
 
                         if self.__actions_hold:
-                            action.push()
+                            actions[i].push()
 
-                        action.release()
+                        actions[i].release()
 
                     self.__hold_active = False
                     self.__hold_was_active = False
@@ -127,11 +153,12 @@ class SwitchController:
             self.__hold_active = True
             return
         
-        for action in self.__actions:
-            if not action.enabled:
-                continue
+        actions = self.__actions
+        enabled = self.__get_enabled_bits()
 
-            action.push()
+        for i in range(len(actions)):
+            if enabled & (1 << i):
+                actions[i].push()
 
     # Checks hold time and triggers hold action if exceeded.
     def __check_hold(self):
@@ -142,17 +169,29 @@ class SwitchController:
                 self.__hold_active = False
 
             # Hold click
-            for action in self.__actions_hold:
-                if not action.enabled:
+            actions = self.__actions_hold
+            enabled = self.__get_enabled_bits(True)
+
+            for i in range(len(actions)):
+                if not enabled & (1 << i):
                     continue
 
-                action.push()        
-                action.release()
+                actions[i].push()        
+                actions[i].release()
 
             return True
         
         return False        # Switch is pushed: Has it been pushed before already? 
 
+    # Returns the enabled bitmap for the actions (or hold actions)
+    def __get_enabled_bits(self, hold = False):
+        if not self.__cache_enabled or self.__enabled_version != EnabledState.VERSION:
+            self.__enabled_version = EnabledState.VERSION
+            self.__enabled_bits = _get_enabled_bits(self.__actions)
+            self.__enabled_bits_hold = _get_enabled_bits(self.__actions_hold)
+
+        return self.__enabled_bits_hold if hold else self.__enabled_bits
+
     @property 
     def actions(self):
         return self.__actions + self.__actions_hold
@@ -161,6 +200,11 @@ class SwitchController:
     @property
     def pushed(self):
         return self.__switch.pushed
+
+    # Return if the switch has been pushed at the last processing (does not access the hardware)
+    @property
+    def pushed_state(self):
+        return self.__pushed_state
                     
     # Colors of the switch (array)
     @property
@@ -287,6 +331,15 @@ class ContinuousController:
 
 ##############################################################################################################################
 
+# Returns a bitmap of the enabled states of the passed actions
+def _get_enabled_bits(actions):
+    ret = 0
+    for i in range(len(actions)):
+        if actions[i].enabled:
+            ret |= 1 << i
+    return ret
+
+
 def _flatten_actions(actions):
     ret = []
     for action in actions:
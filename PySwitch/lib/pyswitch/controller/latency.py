@@ -0,0 +1,77 @@
+from array import array
+from time import monotonic_ns
+from ..misc import do_print, fill_up_to
+
+# Upper bounds of the histogram buckets in microseconds. The last bucket takes all latencies above.
+_BUCKETS = (500, 1000, 2000, 5000, 10000, 20000, 50000)
+
+
+# Measures the time from a switch edge (push or release) to the first MIDI data sent by its actions,
+# and keeps a latency histogram per switch. Only data sent while the switch is processed is regarded.
+class LatencyTracer:
+
+    def __init__(self,
+                 budget_millis = 0     # If set, an exception is raised when a latency exceeds this (for simulator tests)
+        ):
+        self.__budget = budget_millis * 1000
+
+        self.names = []                # Switch names
+        self.__histograms = []         # Histogram per switch (array, one entry per bucket)
+        self.__max = array('l')        # Max. latency per switch (microseconds)
+
+        self.__index = -1              # Switch currently being processed
+        self.__start = 0               # Time of the switch edge (nanoseconds)
+
+    # Adds a switch and returns its index
+    def add(self, name):
+        self.names.append(name)
+        self.__histograms.append(array('l', (0 for _ in range(len(_BUCKETS) + 1))))
+        self.__max.append(0)
+        return len(self.names) - 1
+
+    # Must be called when the switch with the passed index changed state, before its actions are processed
+    def edge(self, index):
+        self.__index = index
+        self.__start = monotonic_ns()
+
+    # Must be called after the actions of the switch have been processed
+    def finish(self):
+        self.__index = -1
+
+    # Must be called when MIDI data is sent
+    def sent(self):
+        index = self.__index
+        if index < 0:
+            return
+
+        # Only the first message after an edge is measured
+        self.__index = -1
+
+        latency = (monotonic_ns() - self.__start) // 1000
+
+        bucket = 0
+        while bucket < len(_BUCKETS) and latency > _BUCKETS[bucket]:
+            bucket += 1
+
+        self.__histograms[index][bucket] += 1
+
+        if latency > self.__max[index]:
+            self.__max[index] = latency
+
+        if self.__budget and latency > self.__budget:
+            raise Exception() # Latency budget exceeded (see debugLatencyBudgetMillis option)
+
+    # Prints the histograms of all switches which have sent data
+    def print(self):
+        for i in range(len(self.names)):
+            histogram = self.__histograms[i]
+            if not any(histogram):
+                continue
+
+            buckets = ", ".join([
+                ("<=" + repr(_BUCKETS[b] / 1000) if b < len(_BUCKETS) else ">" + repr(_BUCKETS[-1] / 1000)) + "ms: " + repr(histogram[b])
+                for b in range(len(histogram))
+                if histogram[b]
+            ])
+
+            do_print(f"{ fill_up_to('Latency ' + str(self.names[i]), 30, '.') }: { buckets }, Max: { repr(self.__max[i] / 1000) }ms")
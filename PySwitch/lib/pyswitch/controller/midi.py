@@ -31,6 +31,21 @@ from adafruit_midi.system_exclusive import SystemExclusive
 ##################################################################################################
 
 
+# MIDI message with precompiled raw bytes (complete message including status byte, and in case of SysEx
+# also the closing byte). The bytes are sent as they are by adafruit_midi, without conversion. The data
+# can also be a bytearray which is changed in place by the owner.
+class RawMidiMessage(MIDIMessage):
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def __bytes__(self):
+        return self.data
+
+
+##################################################################################################
+
+
 # Describes a routing from source to target, which must be MidiDevices definitions.
 class MidiRouting:
 
@@ -55,13 +70,19 @@ class MidiRouting:
 # the application manually!
 class MidiController:
 
-    # routings must be a list of MidiRouting instances
-    def __init__(self, routings):
+    # routings must be a list of MidiRouting instances. latency_tracer can be a LatencyTracer
+    # which is notified about sent messages.
+    def __init__(self, routings, latency_tracer = None):
         self.__routings_from_appl = [x for x in routings if x.source == MidiRouting.APPLICATION]
         self.__routings_to_appl = [x for x in routings if x.target == MidiRouting.APPLICATION]
         self.__routings_external = [x for x in routings if x.source != MidiRouting.APPLICATION and x.target != MidiRouting.APPLICATION]
 
+        self.__latency_tracer = latency_tracer
+
     def send(self, midi_message):
+        if self.__latency_tracer:
+            self.__latency_tracer.sent()
+
         # Send to all routings which have APPLICATION as source
         for r in self.__routings_from_appl:    
             r.target.send(midi_message)
@@ -1,12 +1,85 @@
-from ..misc import PeriodCounter
+from ..misc import PeriodCounter, Updateable, get_current_millis
+
+# Timer service shared by all previews. Previews register their timeout deadlines and blinking 
+# here, so idle previews do not cost anything per update cycle. All blinking previews share one 
+# blink phase.
+class _PreviewTimers(Updateable):
+    def __init__(self):
+        self.__timeouts = []                    # Previews with a pending timeout
+        self.__next_deadline = None             # Earliest deadline of all pending timeouts
+
+        self.__blinking = []                    # Currently blinking previews
+        self.__blink_period = PeriodCounter(400)
+        self.blink_state = False
+
+    # Calls preview.timeout() after the given amount of milliseconds
+    def set_timeout(self, preview, timeout_millis):
+        preview.deadline = get_current_millis() + timeout_millis
+
+        if not preview in self.__timeouts:
+            self.__timeouts.append(preview)
+
+        if self.__next_deadline == None or preview.deadline < self.__next_deadline:
+            self.__next_deadline = preview.deadline
+
+    def clear_timeout(self, preview):
+        if preview in self.__timeouts:
+            self.__timeouts.remove(preview)
+
+    # Calls preview.blink(state) on every change of the global blink phase
+    def start_blink(self, preview, interval_millis):
+        if not self.__blinking:
+            # First blinking preview determines the blink interval and starts the phase
+            self.__blink_period.interval = interval_millis
+            self.__blink_period.reset()
+            self.blink_state = False
+            
+        if not preview in self.__blinking:
+            self.__blinking.append(preview)
+
+    def stop_blink(self, preview):
+        if preview in self.__blinking:
+            self.__blinking.remove(preview)
+
+    def update(self):
+        if self.__timeouts and get_current_millis() >= self.__next_deadline:
+            self.__process_timeouts()
+
+        if self.__blinking and self.__blink_period.exceeded:
+            self.blink_state = not self.blink_state
+
+            for preview in self.__blinking:
+                preview.blink(self.blink_state)
+
+    def __process_timeouts(self):
+        now = get_current_millis()
+        self.__next_deadline = None
+
+        for preview in self.__timeouts[:]:
+            if preview.deadline <= now:
+                self.__timeouts.remove(preview)
+                preview.timeout()
+
+            elif self.__next_deadline == None or preview.deadline < self.__next_deadline:
+                self.__next_deadline = preview.deadline
+
+
+###################################################################################################
+
 
 # Handler which controle the DisplayLabel override_text mechanisms for usage 
 # as value preview or similar things. It handles the blinking and timeouts etc.
 class ValuePreview:
 
+    # Shared timer service
+    _timers = None
+
     # There is only one ValuePreview handler for each label
     @staticmethod
     def get(label):
+        if not ValuePreview._timers:
+            ValuePreview._timers = _PreviewTimers()
+
         if not hasattr(label, "value_preview"):
             label.value_preview = ValuePreview(
                 create_key = ValuePreview,
@@ -26,15 +99,18 @@ class ValuePreview:
         
         self.label = label
 
-        self.__period = None
-        self.__blink_period = None
+        self.__timeout_millis = None
         self.__stay = False
+        self.deadline = 0                      # Used by the timer service
 
-        self.__blink_state = False
         self.__orig_color = label.text_color
 
         self.__clients = None # List of clients to be canceled when another client enters. Each one must have a cancel() method.
 
+    # Must be called by all users of the preview before usage
+    def init(self, appl):
+        appl.add_updateable(ValuePreview._timers)
+
     # Sets a preview (override) text on the label.
     def preview(self, 
                 text,
@@ -57,25 +133,20 @@ class ValuePreview:
         self.label.override_text = text
         self.label.update_label()
 
-        if timeout_millis:
-            if not self.__period:
-                self.__period = PeriodCounter(timeout_millis)
-            else:
-                self.__period.interval = timeout_millis                
-
-            self.__period.reset()
+        self.__timeout_millis = timeout_millis
+        
+        if timeout_millis and not stay:
+            ValuePreview._timers.set_timeout(self, timeout_millis)
         else:
-            self.__period = None
+            ValuePreview._timers.clear_timeout(self)
+
+        self.__blink_color = blink_color
 
         if blink_interval_millis:
-            if not self.__blink_period:
-                self.__blink_period = PeriodCounter(blink_interval_millis)
-            else:
-                self.__blink_period.interval = blink_interval_millis
+            ValuePreview._timers.start_blink(self, blink_interval_millis)
+            self.blink(ValuePreview._timers.blink_state)
         else:
-            self.__blink_period = None
-
-        self.__blink_color = blink_color
+            ValuePreview._timers.stop_blink(self)
 
         if client:
             if not self.__clients:
@@ -115,35 +186,31 @@ class ValuePreview:
 
     # Reset the display label to its default behaviour, either immediately or after the timeout period.
     def reset(self, immediately = False):
-        self.__blink_period = None
+        ValuePreview._timers.stop_blink(self)
         self.__stay = False
 
         self.label.text_color = self.__orig_color
 
-        if not self.__period:
+        if not self.__timeout_millis:
             immediately = True
 
         if immediately:
-            self.label.override_text = None
-            self.label.update_label()
-            self.__period = None
+            ValuePreview._timers.clear_timeout(self)
+            self.timeout()
         else:
-            self.__period.reset()
+            ValuePreview._timers.set_timeout(self, self.__timeout_millis)
+        
+    # Called by the timer service when the timeout has passed: Free preview display
+    def timeout(self):
+        ValuePreview._timers.stop_blink(self)
         
-    # Must be called regularly
-    def update(self):
         if self.label.override_text:
-            # Free preview display after a period
-            if not self.__stay and self.__period and self.__period.exceeded:
-                self.label.override_text = None
-                self.label.update_label()
-
-            # Blink
-            if self.__blink_period and self.__blink_period.exceeded:
-                self.__blink_state = not self.__blink_state
-
-                if self.__blink_state:
-                    self.label.text_color = self.__blink_color
-                else:
-                    self.label.text_color = self.__orig_color
+            self.label.override_text = None
+            self.label.update_label()
 
+    # Called by the timer service when the global blink phase changes
+    def blink(self, state):
+        if not self.label.override_text:
+            return
+        
+        self.label.text_color = self.__blink_color if state else self.__orig_color
@@ -1,6 +1,16 @@
+from micropython import const
 from ..misc import PeriodCounter
 from ..colors import Colors
 
+# Number of brightness steps of the strobe highlight
+_STROBE_STEPS = const(16)
+
+# Fractional bits of the phase accumulator (the phase itself has 16 bits)
+_PHASE_FRACTION_BITS = const(8)
+
+# Maximum time regarded between two frames (ms), so all intermediate values stay small ints
+_MAX_FRAME_MILLIS = const(200)
+
 class StrobeController:
 
     def __init__(self,
@@ -19,15 +29,23 @@ class StrobeController:
         self.__mapping_state = mapping_state
         self.__mapping_deviance = mapping_deviance
 
-        self.__speed = speed * 2000                 # Determined empirically
-        self.__width = width
+        # Phase increment per ms and deviance unit, in phase units with 16 fractional bits. The period 
+        # of 65536 phase units takes speed * 2000 (determined empirically) deviance units times ms. Limited
+        # so the increment for the maximum deviance (8192) stays a small int.
+        self.__phase_factor = min(max(1, (1 << 32) // int(speed * 2000)), (1 << 17) - 1)
+        self.__width = max(1, int(width * 65536))   # Width of the highlight in phase units (the period is 65536)
         self.__color = color
         self.__dim_factor = dim_factor
+
+        # Brightness lookup for the steps of the highlight. Uses the square of the brightness 
+        # to accomodate for the non-linear NeoPixels.
+        self.__brightnesses = [(step * step) * dim_factor / (_STROBE_STEPS * _STROBE_STEPS) for step in range(_STROBE_STEPS + 1)]
         self.__max_fps = max_fps
         
         self.__switches = None               # List of switches ordered for strobe
         self.__period = None        
-        self.__strobe_pos = 0
+        self.__strobe_pos = 0                # Phase accumulator (16 bits phase, _PHASE_FRACTION_BITS fraction)
+        self.__phase_increment = 0           # Phase increment per ms for the current deviance (same format)
         self.__last_deviance = 8192
         self.__reverse = reverse
 
@@ -40,7 +58,7 @@ class StrobeController:
         
         # Bring the switches into the correct order for strobe
         self.__switches = [s for s in appl.inputs if hasattr(s, "pixels")]
-        self.__current_strobe_brightnesses = [0 for s in self.__switches]
+        self.__current_strobe_steps = [-1 for s in self.__switches]
 
         # Period counter for saving LED updates (restricts the updates to a certain frame rate)
         period = int(1000 / self.__max_fps * len(self.__switches))
@@ -58,6 +76,9 @@ class StrobeController:
         # if self.__num_switches > 4:
         #     self.__num_switches = self.__num_switches / 2
 
+        # Phase offsets of the switches in the strobe period (range [0..65535])
+        self.__phase_offsets = [int((switch_num << 16) / self.__num_switches) for switch_num in range(self.__num_switches)] if self.__num_switches > 0 else []
+
     # Listen to client value returns
     def parameter_changed(self, mapping):
         if self.__num_switches <= 1:
@@ -71,6 +92,10 @@ class StrobeController:
                 # Tuner on
                 self.__enabled = True
                 self.__period.reset()
+
+                # Force all LEDs to be written in the first frame
+                for i in range(len(self.__current_strobe_steps)):
+                    self.__current_strobe_steps[i] = -1
             else:
                 # Tuner off
                 self.__enabled = False
@@ -78,6 +103,7 @@ class StrobeController:
         if mapping == self.__mapping_deviance:
             if value != self.__last_deviance:
                 self.__last_deviance = value               
+                self.__update_phase_increment()
 
             self.__update_strobe()
 
@@ -85,6 +111,19 @@ class StrobeController:
     def request_terminated(self, mapping):
         pass                                       # pragma: no cover
 
+    # Determines the phase increment per ms for the current deviance. All intermediate values stay below 2^30.
+    def __update_phase_increment(self):
+        # Restrict range of the deviance
+        delta = (8191 - self.__last_deviance) if self.__reverse else (self.__last_deviance - 8191)
+
+        threshold = 100 * self.__period.interval if self.__period else 8192
+        if delta > threshold:
+            delta = threshold
+        if delta < -threshold:
+            delta = -threshold
+
+        self.__phase_increment = (delta * self.__phase_factor) >> (16 - _PHASE_FRACTION_BITS)
+
     # Update the strobe LEDs
     def __update_strobe(self):
         if not self.__enabled:
@@ -94,59 +133,36 @@ class StrobeController:
         if not self.__period.exceeded:
             return
 
-        speed = self.__speed
-        width = self.__width
+        if passed > _MAX_FRAME_MILLIS:
+            passed = _MAX_FRAME_MILLIS
 
-        # Accumulate deviances and restrict range
-        delta = (8191 - self.__last_deviance) if self.__reverse else (self.__last_deviance - 8191)
+        width = self.__width
 
-        threshold = 100 * self.__period.interval
-        if delta > threshold:
-            delta = threshold
-        if delta < -threshold:
-            delta = -threshold
+        # Integer phase accumulator, wrapped to the period
+        self.__strobe_pos = (self.__strobe_pos - self.__phase_increment * passed) & ((1 << (16 + _PHASE_FRACTION_BITS)) - 1)
         
-        self.__strobe_pos -= delta * passed
+        # Phase in range [0..65535]
+        phase = self.__strobe_pos >> _PHASE_FRACTION_BITS
 
-        while self.__strobe_pos > speed:
-            self.__strobe_pos -= speed
-        while self.__strobe_pos < -speed:
-            self.__strobe_pos += speed
-        
-        # Put to range [0..1], regarding speed
-        pos = (self.__strobe_pos % speed) / speed
+        # Color each switch
+        for switch_num in range(self.__num_switches):
+            # Position inside the period [0..65535]
+            p = (phase + self.__phase_offsets[switch_num]) & 0xffff
 
-        # Defines the period function in range [0..1] for inputs in range [0..1] 
-        # (starts with 1, goes to zero in the middle and goes up to 1 again at the end)
-        def b(p, width):
+            # Brightness step [0.._STROBE_STEPS]: Starts with full brightness, goes to zero in the 
+            # middle and goes up to full brightness again at the end of the period.
             if p <= width:
-                return 1 - p * (1 / width)
-            elif p >= 1 - width:
-                return (p - 1 + width) * (1 / width)
+                step = ((width - p) * _STROBE_STEPS) // width
+            elif p >= 65536 - width:
+                step = ((p - 65536 + width) * _STROBE_STEPS) // width
             else:
-                return 0
-
-        # Color each switch
-        for switch_num in range(len(self.__switches)):
-            switch = self.__switches[switch_num]
+                step = 0
             
-            # Position inside the period [0..1]
-            p = pos + switch_num / self.__num_switches
+            if self.__current_strobe_steps[switch_num] == step:
+                continue
 
-            while p > 1:
-                p -= 1
-            while p < 0:
-                p += 1
+            self.__current_strobe_steps[switch_num] = step
 
-            # Brightness [0..1]
-            brightness = b(p, width)
-            brightness = int(brightness * 16) / 16
-            
-            # Use the square of the calculated brightness to accomodate for the non-linear NeoPixels
+            switch = self.__switches[switch_num]
             switch.color = self.__color
-            brightness_out = (brightness * brightness) * self.__dim_factor
-
-            if self.__current_strobe_brightnesses[switch_num] != brightness_out:
-                self.__current_strobe_brightnesses[switch_num] = brightness_out
-
-                switch.brightness = brightness_out
\ No newline at end of file
+            switch.brightness = self.__brightnesses[step]
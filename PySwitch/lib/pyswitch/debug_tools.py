@@ -1,4 +1,4 @@
-from .controller.midi import SystemExclusive, ControlChange, ProgramChange, MIDIUnknownEvent
+from .controller.midi import SystemExclusive, ControlChange, ProgramChange, MIDIUnknownEvent, RawMidiMessage
 
 # Stringifies a MIDI message.
 def stringify_midi_message(midi_message):
@@ -21,6 +21,10 @@ def stringify_midi_message(midi_message):
     elif isinstance(midi_message, MIDIUnknownEvent):    
         # Unknown
         ret = repr(midi_message.status)
+
+    elif isinstance(midi_message, RawMidiMessage):
+        # Precompiled raw bytes
+        ret = _stringify_midi_message_part(midi_message.data)
     
     else:
         # All others
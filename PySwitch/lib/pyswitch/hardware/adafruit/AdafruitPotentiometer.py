@@ -4,9 +4,11 @@ from analogio import AnalogIn as _AnalogIn
 class AdafruitPotentiometer:
     
     # port: The board GPIO pin definition to be used for this pot (for example board.GP1)
-    def __init__(self, port):
+    # oversampling: Number of ADC readings averaged for each value (reduces noise)
+    def __init__(self, port, oversampling = 4):
         self.port = port
         self.__input = None
+        self.__oversampling = max(1, int(oversampling))
 
     # Initializes the input to the GPIO port
     def init(self):
@@ -22,4 +24,11 @@ class AdafruitPotentiometer:
         if not self.__input:
             return None
         
-        return self.__input.value
\ No newline at end of file
+        if self.__oversampling == 1:
+            return self.__input.value
+        
+        total = 0
+        for i in range(self.__oversampling):
+            total += self.__input.value
+
+        return total // self.__oversampling
\ No newline at end of file
@@ -1,4 +1,5 @@
 from time import monotonic
+from gc import collect
 
 # PySwitch version
 PYSWITCH_VERSION = "2.4.8"
@@ -18,6 +19,20 @@ def do_print(msg):  # pragma: no cover
 # Returns a current timestmap in integer milliseconds
 def get_current_millis():
     return int(monotonic() * 1000)
+
+# Number of garbage collections done by collect_garbage()
+_num_collections = 0
+
+# Collects garbage. Use this instead of gc.collect(), so intentional collections are not counted 
+# as forced by the runtime (see CollectScheduler).
+def collect_garbage():
+    global _num_collections
+    collect()
+    _num_collections += 1
+
+# Returns the number of garbage collections done by collect_garbage()
+def get_num_collections():
+    return _num_collections
     
 # # Returns a readable string with the current timestamp (local time)
 # def formatted_timestamp():
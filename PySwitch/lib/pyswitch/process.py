@@ -31,6 +31,16 @@ if not _get_option(_Config, "exploreMode"):
     # Load communication configuration
     from communication import Communication as _Communication  
 
+    # Optional latency tracing from switch edges to sent MIDI messages
+    if _get_option(_Config, "debugLatency"):
+        from pyswitch.controller.latency import LatencyTracer as _LatencyTracer
+
+        _latency_tracer = _LatencyTracer(
+            budget_millis = _get_option(_Config, "debugLatencyBudgetMillis", 0)
+        )
+    else:
+        _latency_tracer = None
+
     # Optional Wrapper to include the PyMidiBridge for transfering files.
     # Disable this to save memory.
     if _get_option(_Config, "enableMidiBridge"):
@@ -38,13 +48,15 @@ if not _get_option(_Config, "exploreMode"):
 
         _midi = _MidiBridgeWrapper(
             midi = _MidiController(
-                routings = _Communication["midi"]["routings"]
+                routings = _Communication["midi"]["routings"],
+                latency_tracer = _latency_tracer
             ),
             temp_file_path = '/.bridge_tmp'
         )
     else:
         _midi = _MidiController(
-            routings = _Communication["midi"]["routings"]
+            routings = _Communication["midi"]["routings"],
+            latency_tracer = _latency_tracer
         )
 
     try:
@@ -59,6 +71,7 @@ if not _get_option(_Config, "exploreMode"):
             midi = _midi,
             config = _Config, 
             inputs = _Inputs,
+            latency_tracer = _latency_tracer,
             ui = _UiController(
                 display_driver = _display_driver,
                 font_loader = _FontLoader(),
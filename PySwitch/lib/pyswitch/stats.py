@@ -1,6 +1,7 @@
 from micropython import const
-from gc import collect, mem_free, mem_alloc
-from .misc import do_print, format_size, fill_up_to #, PeriodCounter, get_current_millis
+from array import array
+from gc import mem_free, mem_alloc
+from .misc import do_print, format_size, fill_up_to, collect_garbage #, PeriodCounter, get_current_millis
 
 #from functools import wraps
 
@@ -70,7 +71,7 @@ class Memory:
     # Returns free bytes of memory
     @staticmethod
     def _get_free_bytes():
-        collect()
+        collect_garbage()
         return mem_free()
 
     # Output formatting for the prefixes
@@ -102,6 +103,94 @@ class Memory:
 #############################################################################################################################
 
 
+# Named set of counters and values for debug output. All instances are printed periodically by the 
+# controller when the "debugStats" option is enabled.
+class Statistics:
+
+    # All created instances
+    INSTANCES = []
+
+    def __init__(self, name):
+        self.name = name
+        self.values = {}
+
+        Statistics.INSTANCES.append(self)
+
+    # Adds amount to a counter
+    def add(self, key, amount = 1):
+        self.values[key] = self.values[key] + amount if key in self.values else amount
+
+    # Sets a value
+    def set(self, key, value):
+        self.values[key] = value
+
+    # Sets a value if it is greater than the current one
+    def max(self, key, value):
+        if key not in self.values or self.values[key] < value:
+            self.values[key] = value
+
+    # Prints the values of all instances
+    @staticmethod
+    def print_all():
+        for s in Statistics.INSTANCES:
+            if not s.values:
+                continue
+
+            do_print(f"{ fill_up_to(str(s.name), 30, '.') }: { ', '.join([k + ': ' + repr(s.values[k]) for k in s.values]) }")
+
+
+#############################################################################################################################
+
+
+# Allocation accounting per subsystem. Takes snapshots of mem_alloc() (without collecting) around 
+# the measured code sections and accumulates the allocated bytes per section. Sections where a 
+# garbage collection took place (negative deltas) are ignored.
+class Allocations:
+    
+    def __init__(self, name = "Allocations"):
+        self.name = name
+        self.names = []                  # Subsystem names
+        self.bytes = array('l')          # Allocated bytes per subsystem since the last report
+        self.__ticks = 0
+        self.__start = 0
+
+    # Adds a subsystem and returns its index
+    def add(self, name):
+        self.names.append(name)
+        self.bytes.append(0)
+        return len(self.names) - 1
+
+    # Start a measured section
+    def start(self):
+        self.__start = mem_alloc()
+
+    # Finish a measured section, accounting the allocated memory to the passed subsystem index
+    def finish(self, index):
+        delta = mem_alloc() - self.__start
+        if delta > 0:
+            self.bytes[index] += delta
+
+    # Must be called once per tick
+    def tick(self):
+        self.__ticks += 1
+
+    # Prints the top allocating subsystems (bytes per tick) and resets the accumulated values
+    def print_top(self, num = 5):
+        if not self.__ticks:
+            return
+        
+        indices = sorted(range(len(self.bytes)), key = lambda i: self.bytes[i], reverse = True)[:num]
+
+        do_print(f"{ fill_up_to(str(self.name), 30, '.') }: { ', '.join([self.names[i] + ': ' + repr(self.bytes[i] // self.__ticks) + 'B/tick' for i in indices if self.bytes[i] > 0]) }")
+
+        for i in range(len(self.bytes)):
+            self.bytes[i] = 0
+        self.__ticks = 0
+
+
+#############################################################################################################################
+
+
 # Runtime measurement tool, which can be attached to functions as decorator
 #class RuntimeStatistics:
 
@@ -1,5 +1,7 @@
+from gc import mem_alloc
 from .ui import DisplayBounds
-from ..misc import Updateable, Updater
+from ..misc import Updateable, Updater, get_current_millis
+from ..stats import Statistics
 
 
 class UiController(Updater, Updateable):
@@ -14,6 +16,12 @@ class UiController(Updater, Updateable):
 
         self.__current_splash_element = None
 
+        # Splash element -> list of its Updateables (compiled when the splash is shown for the first time)
+        self.__splash_updateables = {}
+
+        # Swap times and memory retained by the cached splashes (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Splash")
+
     def set_callback(self, splash_callback):
         self.__splash_callback = splash_callback
 
@@ -37,13 +45,35 @@ class UiController(Updater, Updateable):
     def update(self):
         Updater.update(self)
 
-    # Shows the current splash
+    # Shows the current splash. Each splash is compiled only once: Afterwards, switching 
+    # between splashes just swaps the cached updateables and displayio groups.
     def show(self):
         # Get DisplayElement from callback
         splash_element = self.__splash_callback.get_root()
 
         if splash_element == self.__current_splash_element:
             return
+        
+        start = get_current_millis()
+
+        updateables = self.__splash_updateables.get(splash_element, None)
+        
+        if updateables == None:
+            updateables = self.__compile(splash_element)
+        
+        # Show splash
+        self.updateables = updateables
+        self.__current_splash_element = splash_element
+        self.__display_driver.tft.show(splash_element.splash)
+
+        duration = get_current_millis() - start
+        self.__stats.add("swaps")
+        self.__stats.set("lastMs", duration)
+        self.__stats.max("maxMs", duration)
+
+    # Initializes a splash element and caches its Updateables
+    def __compile(self, splash_element):
+        allocated_before = mem_alloc()
 
         # Make it a splash (creates the Group if not yet done)
         splash_element.make_splash(self.__font_loader)
@@ -52,8 +82,16 @@ class UiController(Updater, Updateable):
             splash_element.init(splash_element, self.__appl)
 
         # Add elements which are Updateables to the update queue
-        self.updateables = [i for i in splash_element.contents_flat() if isinstance(i, Updateable)]
+        updateables = [i for i in splash_element.contents_flat() if isinstance(i, Updateable)]
+        self.__splash_updateables[splash_element] = updateables
+
+        self.__stats.set("splashes", len(self.__splash_updateables))
+
+        # Retained memory per splash, labeled by the splash ID (or its index if no ID is set). A negative
+        # delta means that garbage has been collected in between, so the value is not known then.
+        allocated = mem_alloc() - allocated_before
+        if allocated >= 0:
+            label = repr(splash_element.id) if splash_element.id else "#" + repr(len(self.__splash_updateables))
+            self.__stats.set("bytes splash " + label, allocated)
         
-        # Show splash
-        self.__current_splash_element = splash_element
-        self.__display_driver.tft.show(splash_element.splash)
+        return updateables
@@ -1,13 +1,14 @@
-from gc import collect
 from micropython import const
-from displayio import Group
+from displayio import Group, Bitmap, Palette, TileGrid
+from bitmaptools import fill_region
 from adafruit_display_text import label, wrap_text_to_pixels
 from adafruit_display_shapes.rect import Rect
 
 from .ui import DisplayBounds, DisplayElement
 
 from ..controller.client import BidirectionalClient
-from ..misc import Updateable, get_option #, do_print
+from ..misc import Updateable, PeriodCounter, get_option, get_current_millis, collect_garbage #, do_print
+from ..stats import Statistics
 from ..colors import Colors
 
 
@@ -42,12 +43,62 @@ class DisplayLabelLayout:
 ######################################################################################################################################
 
 
+# Bounded LRU cache for wrapped label texts, shared by all labels. Rig and effect names mostly 
+# cycle through a small set of strings, so most wrap operations (which measure every glyph) can be skipped.
+class _WrapCache:
+    def __init__(self, size):
+        self.__size = size
+        self.__entries = {}         # (font, max width, text) -> wrapped text
+        self.__keys = []            # Keys in order of usage (least recently used first)
+        self.__bytes = 0
+
+        # Hit rate and memory (shown when the debugStats option is enabled)
+        self.__stats = Statistics("Text wrap cache")
+        self.__hits = 0
+        self.__misses = 0
+
+    # Returns the wrapped text, or None if not cached
+    def get(self, key):
+        wrapped = self.__entries.get(key, None)
+
+        if wrapped == None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+
+            if self.__keys[-1] != key:
+                self.__keys.remove(key)
+                self.__keys.append(key)
+
+        self.__stats.set("hitPercent", self.__hits * 100 // (self.__hits + self.__misses))
+        return wrapped
+        
+    def put(self, key, wrapped):
+        if len(self.__keys) >= self.__size:
+            oldest = self.__keys.pop(0)
+            self.__bytes -= len(oldest[2]) + len(self.__entries[oldest])
+            del self.__entries[oldest]
+
+        self.__entries[key] = wrapped
+        self.__keys.append(key)
+        self.__bytes += len(key[2]) + len(wrapped)
+
+        self.__stats.set("entries", len(self.__keys))
+        self.__stats.set("textBytes", self.__bytes)
+
+
 # Controller for a generic rectangular label on the user interface.
 class DisplayLabel(DisplayElement):
 
     # Line feed used for display
     LINE_FEED = "\n"
 
+    # Maximum number of cached wrapped texts
+    WRAP_CACHE_SIZE = 32
+
+    # Shared cache for wrapped texts (created on first usage)
+    _wrap_cache = None
+
     def __init__(self, layout = None, bounds = DisplayBounds(), name = "", id = 0, scale = 1, callback = None):
         super().__init__(bounds = bounds, name = name, id = id)
 
@@ -92,7 +143,7 @@ class DisplayLabel(DisplayElement):
 
         # Append background, if any
         if self.__layout.back_color:
-            collect()
+            collect_garbage()
             self.__background = Rect(
                 x = self.bounds.x + self.__layout.stroke, 
                 y = self.bounds.y + self.__layout.stroke,
@@ -203,13 +254,23 @@ class DisplayLabel(DisplayElement):
             return ""
         
         if self.__layout.max_text_width:
-            return DisplayLabel.LINE_FEED.join(
-                wrap_text_to_pixels(
-                    text, 
-                    self.__layout.max_text_width,
-                    self.__font
+            if not DisplayLabel._wrap_cache:
+                DisplayLabel._wrap_cache = _WrapCache(DisplayLabel.WRAP_CACHE_SIZE)
+
+            key = (self.__font, self.__layout.max_text_width, text)
+
+            wrapped = DisplayLabel._wrap_cache.get(key)
+            if wrapped == None:
+                wrapped = DisplayLabel.LINE_FEED.join(
+                    wrap_text_to_pixels(
+                        text, 
+                        self.__layout.max_text_width,
+                        self.__font
+                    )
                 )
-            )
+                DisplayLabel._wrap_cache.put(key, wrapped)
+
+            return wrapped
         else:
             return text
 
@@ -230,7 +291,7 @@ class DisplayLabel(DisplayElement):
 ###########################################################################################################################
 
 
-class TunerDisplay(DisplayElement):
+class TunerDisplay(DisplayElement, Updateable):
 
     # DisplayElement for the deviance bar
     class _TunerDevianceDisplay(DisplayElement):
@@ -249,7 +310,7 @@ class TunerDisplay(DisplayElement):
             DisplayElement.__init__(self, bounds = bounds, id = id)
 
             self.width = width
-            self.__zoom = zoom
+            self.__zoom = int(zoom * 256)     # Fixed point with 8 bits fraction
 
             self.__color_in_tune = color_in_tune
             self.__color_out_of_tune = color_out_of_tune
@@ -258,12 +319,13 @@ class TunerDisplay(DisplayElement):
             self.__calibration_low = calibration_low
 
             self.__current_color = None
+            self.__current_x = -1
             self.in_tune = False
 
         def init(self, ui, appl):
             DisplayElement.init(self, ui, appl)
             
-            collect()
+            collect_garbage()
 
             self.__marker_intune = Rect(
                 x = int((self.bounds.width - self.width) * 0.5),
@@ -283,16 +345,21 @@ class TunerDisplay(DisplayElement):
                 fill = self.__color_in_tune
             )
             self.__current_color = self.__marker.fill
+            self.__current_x = self.__marker.x
 
             ui.splash.append(self.__marker)
 
-        # Sets deviance value in range [0..16383]
+        # Sets deviance value in range [0..16383]. Only the x position of the marker is changed (integer math only).
         def set(self, value):
             value_scaled = value
-            if self.__zoom != 1:
-                value_scaled = max(-8192, min(int((value - 8192) * self.__zoom), 8192)) + 8191
+            if self.__zoom != 256:
+                value_scaled = max(-8192, min(((value - 8192) * self.__zoom) >> 8, 8192)) + 8191
 
-            self.__marker.x = int((self.bounds.width - self.width) * value_scaled / 16384)
+            x = ((self.bounds.width - self.width) * value_scaled) >> 14
+
+            if x != self.__current_x:
+                self.__current_x = x
+                self.__marker.x = x
 
             if value >= self.__calibration_low and value <= self.__calibration_high:
                 self.in_tune = True
@@ -322,6 +389,9 @@ class TunerDisplay(DisplayElement):
                  deviance_height = 40,                     # Height of the deviance display
                  deviance_width = 5,                       # Width of the deviance display pointer line and "in tune" marker
                  deviance_zoom = 2.4,                      # Scaling of values. Set to > 1 to make the tuner display more sensitive.
+                 deviance_max_fps = 30,                    # Maximum frame rate of the deviance display. Incoming values are decimated to this rate.
+                 deviance_smoothing = 1,                   # Smoothing of the deviance values: 0 means no smoothing, each step up halves the 
+                                                           # weight of new values (integer exponential moving average).
                  color_in_tune = Colors.LIGHT_GREEN,
                  color_out_of_tune = Colors.ORANGE,
                  color_neutral = Colors.WHITE,
@@ -364,8 +434,14 @@ class TunerDisplay(DisplayElement):
             )            
             self.add(self.deviance)
 
+            self.__deviance_period = PeriodCounter(int(1000 / deviance_max_fps))
+            self.__smoothing = int(deviance_smoothing)
+
+            # Rendering statistics (shown when the debugStats option is enabled)
+            self.__stats = Statistics("Tuner deviance")
+
         self.__last_note = None
-        self.__last_deviance = 8192
+        self.__reset_deviance()
 
     # We need access to the client, so we store appl here
     def init(self, ui, appl):
@@ -381,11 +457,18 @@ class TunerDisplay(DisplayElement):
     # Reset the display
     def reset(self):
         self.__last_note = None
-        self.__last_deviance = 8192
+        self.__reset_deviance()
         
         self.label_note.text = "-"
         self.label_note.text_color = self.__color_neutral
 
+    def __reset_deviance(self):
+        self.__last_deviance = 8192
+        self.__pending_deviance = None       # Latest received deviance value not yet rendered
+        self.__pending_since = 0             # Time when the oldest not yet rendered value came in
+        self.__last_received = 8192          # Latest received deviance value
+        self.__filter = -1                   # Smoothing accumulator (filtered value shifted up by the smoothing factor)
+
     # Listen to client value returns
     def parameter_changed(self, mapping):
         value = mapping.value
@@ -395,18 +478,66 @@ class TunerDisplay(DisplayElement):
 
             self.label_note.text = self.__note_names[value % 12]            
 
-        if mapping == self.__mapping_deviance and value != self.__last_deviance:
-            self.__last_deviance = value               
+        if mapping == self.__mapping_deviance:
+            if self.__pending_deviance == None:
+                self.__pending_since = get_current_millis()
+
+            self.__pending_deviance = value
+            self.__last_received = value
+            self.__stats.add("received")
+
+            # Values coming in faster than the display frame rate are held back: The latest one
+            # is rendered with the next incoming value after the frame period has passed, or in update().
+            if self.__deviance_period.exceeded:
+                self.__render_deviance()
+
+    # The device only sends deviance values on change, so a held back value is rendered here when no 
+    # further values come in. With smoothing, the latest value is fed again until the display has settled.
+    def update(self):
+        if not self.__mapping_deviance:
+            return
+        
+        if self.__pending_deviance == None:
+            if self.__smoothing == 0 or self.__filter < 0 or (self.__filter >> self.__smoothing) == self.__last_received:
+                return
             
-            self.deviance.set(self.__last_deviance)            
+            self.__pending_since = get_current_millis()
+            self.__pending_deviance = self.__last_received
 
-            # Uncomment this for calibration.
-            #self._debug_calibration(mapping.value)            
+        if self.__deviance_period.exceeded:
+            self.__render_deviance()
+
+    # Renders the latest received deviance value
+    def __render_deviance(self):
+        value = self.__pending_deviance
+        self.__pending_deviance = None
+
+        # Uncomment this for calibration.
+        #self._debug_calibration(value)            
+
+        if self.__smoothing > 0:
+            # Integer exponential moving average with weight 1 / 2^smoothing for new values
+            if self.__filter < 0:
+                self.__filter = value << self.__smoothing
+            else:
+                self.__filter += value - (self.__filter >> self.__smoothing)
+
+            value = self.__filter >> self.__smoothing
+
+        if value != self.__last_deviance:
+            self.__last_deviance = value               
+            
+            self.deviance.set(value)
 
             if self.deviance.in_tune:
                 self.label_note.text_color = self.__color_in_tune
             else:
                 self.label_note.text_color = self.__color_out_of_tune
+
+        latency = get_current_millis() - self.__pending_since
+        self.__stats.add("rendered")
+        self.__stats.set("lastLatencyMs", latency)
+        self.__stats.max("maxLatencyMs", latency)
         
     # Called when the client is offline (requests took too long)
     def request_terminated(self, mapping):
@@ -443,6 +574,91 @@ class TunerDisplay(DisplayElement):
 ###########################################################################################################################
 
 
+# Horizontal progress bar showing the value of a mapping (for example the loop position sent by a DAW).
+# The bar is a bitmap: On value changes, only the segment between the old and the new bar end is written,
+# so displayio only has to transfer that part to the display.
+class ProgressBar(DisplayElement):
+
+    def __init__(self, 
+                 mapping,                      # Mapping delivering the progress value in range [0..max_value]
+                 bounds = DisplayBounds(), 
+                 max_value = 127,              # Value which fills the whole bar
+                 color = Colors.WHITE,         # Bar color
+                 back_color = None,            # Background color. If None, the background is transparent.
+                 name = "", 
+                 id = 0
+        ):
+        DisplayElement.__init__(self, bounds = bounds, name = name, id = id)
+
+        self.__mapping = mapping
+        self.__max_value = max_value
+        self.__color = color
+        self.__back_color = back_color
+
+        self.__bitmap = None
+        self.__current_width = 0
+
+    def init(self, ui, appl):
+        DisplayElement.init(self, ui, appl)
+
+        collect_garbage()
+
+        palette = Palette(2)
+        if self.__back_color:
+            palette[0] = self.__back_color
+        else:
+            palette.make_transparent(0)
+        palette[1] = self.__color
+
+        self.__bitmap = Bitmap(self.bounds.width, self.bounds.height, 2)
+
+        ui.splash.append(
+            TileGrid(
+                self.__bitmap, 
+                pixel_shader = palette, 
+                x = self.bounds.x, 
+                y = self.bounds.y
+            )
+        )
+
+        appl.client.register(self.__mapping, self)
+
+    # Listen to client value returns
+    def parameter_changed(self, mapping):
+        if mapping != self.__mapping:
+            return
+        
+        self.set(mapping.value)
+
+    # Called when the client is offline (requests took too long)
+    def request_terminated(self, mapping):
+        pass                                       # pragma: no cover
+
+    # Sets the progress value in range [0..max_value]
+    def set(self, value):
+        if value == None or value < 0:
+            value = 0
+        if value > self.__max_value:
+            value = self.__max_value
+
+        width = int(self.bounds.width * value / self.__max_value)
+        current = self.__current_width
+
+        if width == current:
+            return
+        
+        # Only write the segment which changed
+        if width > current:
+            fill_region(self.__bitmap, current, 0, width, self.bounds.height, 1)
+        else:
+            fill_region(self.__bitmap, width, 0, current, self.bounds.height, 0)
+
+        self.__current_width = width
+
+
+###########################################################################################################################
+
+
 # Properties for the indicator dots
 _PERFORMANCE_INDICATOR_SIZE = const(4)
 _PERFORMANCE_INDICATOR_MARGIN = const(2)
@@ -476,7 +692,7 @@ class BidirectionalProtocolState(DisplayElement, Updateable):
 
         r = int(self.bounds.width / 2) if self.bounds.width > self.bounds.height else int(self.bounds.height / 2)
         
-        collect()
+        collect_garbage()
         
         self.__dot = Rect(
             x = self.bounds.x, 